@@ -1,11 +1,96 @@
 # analyze_maintenance.py
 
 import os
+import hashlib
 import pandas as pd
 import numpy as np
-from datetime import datetime
-import matplotlib.pyplot as plt
-from utils.excel_handler import create_maintenance_history_sheet
+from openpyxl import load_workbook
+from utils.excel_handler import create_maintenance_history_sheet, read_excel
+
+NS_PER_DAY = 86_400 * 10**9
+NAT_INT64 = np.iinfo(np.int64).min
+ACTION_TYPES = ['Inspection', 'Repair', 'Replacement']
+
+def reduce_intervals(codes, dates):
+    """
+    Reduce maintenance dates to per-asset date and interval statistics.
+    
+    Args:
+        codes (np.ndarray): Integer asset codes, each asset's records contiguous
+        dates (np.ndarray): Dates as int64 nanoseconds, ascending within each asset
+        
+    Returns:
+        dict: Per-asset arrays of record counts, first/last dates and
+            mean/min/max interval in days (NaN for single-record assets)
+    """
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    counts = np.diff(np.r_[starts, len(codes)])
+    
+    # Whole days between consecutive records of the same asset
+    gaps = (np.diff(dates) // NS_PER_DAY)[codes[1:] == codes[:-1]]
+    
+    # Each asset owns a contiguous run of (count - 1) gaps
+    has_gaps = counts > 1
+    offsets = np.r_[0, np.cumsum(counts - 1)[:-1]][has_gaps]
+    avg_interval = np.full(len(counts), np.nan)
+    min_interval = np.full(len(counts), np.nan)
+    max_interval = np.full(len(counts), np.nan)
+    if offsets.size:
+        avg_interval[has_gaps] = np.add.reduceat(gaps, offsets) / (counts[has_gaps] - 1)
+        min_interval[has_gaps] = np.minimum.reduceat(gaps, offsets)
+        max_interval[has_gaps] = np.maximum.reduceat(gaps, offsets)
+    
+    return {
+        'record_count': counts,
+        'first_date': dates[starts],
+        'last_date': dates[starts + counts - 1],
+        'avg_interval': avg_interval,
+        'min_interval': min_interval,
+        'max_interval': max_interval
+    }
+
+def analysis_digest(results_df):
+    """
+    Compute a content hash of the analysis results.
+    
+    Args:
+        results_df (pd.DataFrame): Analysis results
+        
+    Returns:
+        str: Hex digest of the results' row hashes
+    """
+    row_hashes = pd.util.hash_pandas_object(results_df, index=False).values
+    return hashlib.blake2b(row_hashes.tobytes()).hexdigest()
+
+def analysis_hash_path(history_path):
+    """Return the sidecar file storing the digest of the last exported analysis."""
+    directory, filename = os.path.split(history_path)
+    return os.path.join(directory, f".{os.path.splitext(filename)[0]}_analysis.hash")
+
+def is_export_current(history_path, digest):
+    """
+    Check whether the history workbook already holds an analysis with this digest.
+    
+    Args:
+        history_path (str): Path to the maintenance history Excel file
+        digest (str): Digest of the analysis about to be exported
+        
+    Returns:
+        bool: True if the stored digest matches and the analysis sheet still exists
+    """
+    hash_path = analysis_hash_path(history_path)
+    if not os.path.exists(hash_path):
+        return False
+    with open(hash_path, 'r') as f:
+        if f.read().strip() != digest:
+            return False
+    
+    # Read-only mode only parses the workbook index to list the sheets
+    wb = load_workbook(history_path, read_only=True)
+    try:
+        return "Maintenance Analysis" in wb.sheetnames
+    finally:
+        wb.close()
 
 def analyze_maintenance(history_path='data/maintenance_history.xlsx', export=True):
     """
@@ -28,7 +113,12 @@ def analyze_maintenance(history_path='data/maintenance_history.xlsx', export=Tru
     
     # Load maintenance history
     try:
-        df = pd.read_excel(history_path, sheet_name="Maintenance History")
+        df = read_excel(
+            history_path,
+            sheet_name="Maintenance History",
+            usecols=['asset_id', 'date', 'cost', 'action_taken'],
+            dtype={'cost': 'float64'}
+        )
         if df.empty:
             print("Maintenance history is empty. Please log some records first.")
             return None
@@ -41,76 +131,74 @@ def analyze_maintenance(history_path='data/maintenance_history.xlsx', export=Tru
     # Convert date strings to datetime objects
     df['date'] = pd.to_datetime(df['date'])
     
+    # Encode key columns once; everything below works on integer codes
+    df = df.dropna(subset=['asset_id'])
+    df['asset_id'] = df['asset_id'].astype('category')
+    df['action_taken'] = pd.Categorical(df['action_taken'], categories=ACTION_TYPES)
+    asset_ids = df['asset_id'].cat.categories
+    
     # Sort by asset_id and date
     df = df.sort_values(['asset_id', 'date'])
+    # Widen codes: cat.codes is int8 for small category counts and would overflow below
+    codes = df['asset_id'].cat.codes.to_numpy().astype(np.intp)
     
-    # Group by asset_id
-    asset_groups = df.groupby('asset_id')
+    # Every record counts, including those without a usable date
+    n_assets = len(asset_ids)
+    record_count = np.bincount(codes, minlength=n_assets)
     
-    # Initialize results DataFrame
-    results = []
+    # Reduce dates per asset over contiguous int64 arrays; NaT would read as INT64_MIN
+    has_date = df['date'].notna().to_numpy()
+    dates = df['date'].values.astype('datetime64[ns]').view('int64')[has_date]
+    dated_codes = codes[has_date]
+    first_date = np.full(n_assets, NAT_INT64)
+    last_date = np.full(n_assets, NAT_INT64)
+    avg_interval = np.full(n_assets, np.nan)
+    min_interval = np.full(n_assets, np.nan)
+    max_interval = np.full(n_assets, np.nan)
+    if dated_codes.size:
+        stats = reduce_intervals(dated_codes, dates)
+        # Codes are sorted, so the unique codes line up with the kernel's runs
+        present = np.unique(dated_codes)
+        first_date[present] = stats['first_date']
+        last_date[present] = stats['last_date']
+        avg_interval[present] = stats['avg_interval']
+        min_interval[present] = stats['min_interval']
+        max_interval[present] = stats['max_interval']
     
-    # Process each asset
-    for asset_id, group in asset_groups:
-        # Count total records
-        record_count = len(group)
-        
-        # Calculate date intervals (in days)
-        if record_count > 1:
-            # Calculate the difference between consecutive dates
-            dates = group['date'].sort_values().reset_index(drop=True)
-            intervals = [(dates[i] - dates[i-1]).days for i in range(1, len(dates))]
-            avg_interval = sum(intervals) / len(intervals)
-            min_interval = min(intervals) if intervals else np.nan
-            max_interval = max(intervals) if intervals else np.nan
-        else:
-            avg_interval = np.nan
-            min_interval = np.nan
-            max_interval = np.nan
-        
-        # Get first and last maintenance dates
-        first_date = group['date'].min()
-        last_date = group['date'].max()
-        
-        # Calculate total time span
-        time_span = (last_date - first_date).days if record_count > 1 else 0
-        
-        # Calculate frequency (records per year)
-        if time_span > 0:
-            frequency = (record_count / time_span) * 365
-        else:
-            frequency = np.nan
-        
-        # Calculate total cost and average cost
-        total_cost = group['cost'].sum()
-        avg_cost = total_cost / record_count if record_count > 0 else 0
-        
-        # Count maintenance actions by type
-        action_counts = group['action_taken'].value_counts().to_dict()
-        inspections = action_counts.get('Inspection', 0)
-        repairs = action_counts.get('Repair', 0)
-        replacements = action_counts.get('Replacement', 0)
-        
-        # Add to results
-        results.append({
-            'asset_id': asset_id,
-            'record_count': record_count,
-            'first_maintenance': first_date,
-            'last_maintenance': last_date,
-            'time_span_days': time_span,
-            'avg_interval_days': avg_interval,
-            'min_interval_days': min_interval,
-            'max_interval_days': max_interval,
-            'maintenance_frequency': frequency,
-            'total_cost': total_cost,
-            'avg_cost_per_maintenance': avg_cost,
-            'inspections': inspections,
-            'repairs': repairs,
-            'replacements': replacements
-        })
+    # Sum costs and count actions by type with integer histograms
+    total_cost = np.bincount(codes, weights=df['cost'].fillna(0).to_numpy(dtype=float), minlength=n_assets)
+    action_codes = df['action_taken'].cat.codes.to_numpy().astype(np.intp)
+    known = action_codes >= 0
+    action_counts = np.bincount(
+        codes[known] * len(ACTION_TYPES) + action_codes[known],
+        minlength=n_assets * len(ACTION_TYPES)
+    ).reshape(n_assets, len(ACTION_TYPES))
+    
+    # Calculate total time span and frequency (records per year)
+    time_span = (last_date - first_date) // NS_PER_DAY
+    if (first_date == NAT_INT64).any():
+        # Assets with no dated records have no span
+        time_span = np.where(first_date == NAT_INT64, np.nan, time_span)
+    frequency = np.full(len(record_count), np.nan)
+    np.divide(record_count * 365, time_span, out=frequency, where=time_span > 0)
     
     # Create results DataFrame
-    results_df = pd.DataFrame(results)
+    results_df = pd.DataFrame({
+        'asset_id': asset_ids,
+        'record_count': record_count,
+        'first_maintenance': first_date.view('datetime64[ns]'),
+        'last_maintenance': last_date.view('datetime64[ns]'),
+        'time_span_days': time_span,
+        'avg_interval_days': avg_interval,
+        'min_interval_days': min_interval,
+        'max_interval_days': max_interval,
+        'maintenance_frequency': frequency,
+        'total_cost': total_cost,
+        'avg_cost_per_maintenance': total_cost / record_count,
+        'inspections': action_counts[:, 0],
+        'repairs': action_counts[:, 1],
+        'replacements': action_counts[:, 2]
+    })
     
     # Sort by maintenance frequency (descending)
     results_df = results_df.sort_values('maintenance_frequency', ascending=False)
@@ -119,36 +207,34 @@ def analyze_maintenance(history_path='data/maintenance_history.xlsx', export=Tru
     print("\nTop 5 Assets by Maintenance Frequency:")
     print("========================================")
     top_five = results_df.head(5)
-    for i, (_, asset) in enumerate(top_five.iterrows(), 1):
-        print(f"{i}. Asset: {asset['asset_id']}")
-        print(f"   Records: {asset['record_count']}")
+    for i, asset in enumerate(top_five.itertuples(index=False), 1):
+        print(f"{i}. Asset: {asset.asset_id}")
+        print(f"   Records: {asset.record_count}")
         
-        if not np.isnan(asset['avg_interval_days']):
-            print(f"   Average interval: {asset['avg_interval_days']:.1f} days")
+        if not np.isnan(asset.avg_interval_days):
+            print(f"   Average interval: {asset.avg_interval_days:.1f} days")
         else:
             print("   Average interval: N/A (only one record)")
             
-        print(f"   Total cost: ${asset['total_cost']:.2f}")
-        print(f"   Actions: {asset['inspections']} inspections, {asset['repairs']} repairs, {asset['replacements']} replacements")
+        print(f"   Total cost: ${asset.total_cost:.2f}")
+        print(f"   Actions: {asset.inspections} inspections, {asset.repairs} repairs, {asset.replacements} replacements")
         print()
     
     # Export results if requested
     if export and not results_df.empty:
-        try:
-            with pd.ExcelWriter(history_path, engine='openpyxl', mode='a') as writer:
-                # Check if "Maintenance Analysis" sheet already exists
-                if "Maintenance Analysis" in pd.ExcelFile(history_path).sheet_names:
-                    # If exists, we need to remove it first (can't just overwrite with ExcelWriter)
-                    book = writer.book
-                    if "Maintenance Analysis" in book.sheetnames:
-                        std_idx = book.sheetnames.index("Maintenance Analysis")
-                        book.remove(book.worksheets[std_idx])
-                        
-                # Write the new analysis
-                results_df.to_excel(writer, sheet_name="Maintenance Analysis", index=False)
+        digest = analysis_digest(results_df)
+        if is_export_current(history_path, digest):
+            print(f"Analysis unchanged since last export to {history_path}, skipping export.")
+        else:
+            try:
+                # Replace any previous analysis sheet in the same workbook load
+                with pd.ExcelWriter(history_path, engine='openpyxl', mode='a', if_sheet_exists='replace') as writer:
+                    results_df.to_excel(writer, sheet_name="Maintenance Analysis", index=False)
+                with open(analysis_hash_path(history_path), 'w') as f:
+                    f.write(digest)
                 print(f"Analysis exported to {history_path}, sheet 'Maintenance Analysis'")
-        except Exception as e:
-            print(f"Error exporting analysis: {e}")
+            except Exception as e:
+                print(f"Error exporting analysis: {e}")
     
     return results_df
 
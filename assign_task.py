@@ -3,14 +3,42 @@
 import os
 import sys
 import json
-import uuid
-import pandas as pd
+import time
 import argparse
+import secrets
+import threading
 from datetime import datetime
 
 # Add parent directory to path to import modules
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from utils.excel_handler import create_sheets_from_schema, create_tasks_sheet
+# pandas and utils.excel_handler are imported where used to keep CLI start-up fast
+
+# Per-process node bits: low PID bits keep concurrent processes apart, random bits cover PID reuse
+_task_node = ((os.getpid() & 0xFFFF) << 12) | secrets.randbits(12)
+_task_lock = threading.Lock()
+_task_last_micros = 0
+_task_sequence = 0
+
+def generate_task_id():
+    """Generate a compact, time-ordered task ID with TASK prefix."""
+    global _task_last_micros, _task_sequence
+    with _task_lock:
+        micros = time.time_ns() // 1000
+        if micros <= _task_last_micros:
+            # Same microsecond (or the clock stepped back): stay ordered via the sequence
+            micros = _task_last_micros
+            _task_sequence += 1
+            if _task_sequence > 0xFFF:
+                # Sequence exhausted: move to the next microsecond instead of wrapping
+                micros += 1
+                _task_sequence = 0
+        else:
+            _task_sequence = 0
+        _task_last_micros = micros
+        
+        # Microsecond timestamp, 28-bit process node, 12-bit sequence
+        value = (micros << 40) | (_task_node << 12) | _task_sequence
+    return f"TASK-{value:024X}"
 
 def load_schema(schema_path):
     """Load JSON schema from file."""
@@ -25,8 +53,10 @@ def validate_contractor(contractor_id, contractors_df, contractors_schema):
 
 def load_open_incidents():
     """Load open incidents from incidents.xlsx."""
+    import pandas as pd
+    from utils.excel_handler import read_excel
     try:
-        incidents_df = pd.read_excel("data/incidents.xlsx")
+        incidents_df = read_excel("data/incidents.xlsx", usecols=["Incident ID", "Severity", "Status"])
         # Filter for open incidents (assuming 'Status' column with 'Open' value)
         open_incidents = incidents_df[incidents_df['Status'] == 'Open']
         return open_incidents
@@ -36,8 +66,10 @@ def load_open_incidents():
 
 def load_contractors():
     """Load contractors from contractors.xlsx."""
+    import pandas as pd
+    from utils.excel_handler import read_excel
     try:
-        return pd.read_excel("data/contractors.xlsx")
+        return read_excel("data/contractors.xlsx", usecols=["contractor_id", "name", "specialties", "rating"])
     except Exception as e:
         print(f"Error loading contractors: {e}")
         return pd.DataFrame()
@@ -86,22 +118,16 @@ def display_contractors(contractors_df):
 
 def assign_task(incident_id, contractor_id, details=""):
     """Assign a task to a contractor for an incident."""
+    from utils.excel_handler import create_tasks_sheet, load_workbook, save_workbook
     tasks_file = "data/tasks.xlsx"
     
     # Check if tasks file exists, if not create it
     if not os.path.exists(tasks_file):
         create_tasks_sheet(tasks_file)
     
-    # Load existing tasks
-    try:
-        tasks_df = pd.read_excel(tasks_file)
-    except Exception as e:
-        print(f"Error loading tasks: {e}")
-        tasks_df = pd.DataFrame(columns=["Task ID", "Incident ID", "Contractor ID", "Assigned At", "Status", "Details"])
-    
     # Create new task
     new_task = {
-        "Task ID": str(uuid.uuid4()),
+        "Task ID": generate_task_id(),
         "Incident ID": incident_id,
         "Contractor ID": contractor_id,
         "Assigned At": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
@@ -109,11 +135,20 @@ def assign_task(incident_id, contractor_id, details=""):
         "Details": details
     }
     
-    # Append new task
-    tasks_df = tasks_df._append(new_task, ignore_index=True)
-    
-    # Save updated tasks
-    tasks_df.to_excel(tasks_file, index=False)
+    # Append new task as a single row instead of rewriting the whole sheet
+    try:
+        wb = load_workbook(tasks_file)
+        ws = wb.active
+        headers = [cell.value for cell in ws[1]]
+        for column in new_task:
+            if column not in headers:
+                headers.append(column)
+                ws.cell(row=1, column=len(headers), value=column)
+        ws.append([new_task.get(header) for header in headers])
+        save_workbook(wb, tasks_file)
+    except Exception as e:
+        print(f"Error saving task: {e}")
+        return None
     
     print(f"\nTask assigned successfully!")
     print(f"Task ID: {new_task['Task ID']}")
@@ -132,6 +167,7 @@ def main():
     
     # Ensure required files exist
     if not os.path.exists("data/contractors.xlsx"):
+        from utils.excel_handler import create_sheets_from_schema
         create_sheets_from_schema("contractors_schema.json", "data/contractors.xlsx")
         print("Created data/contractors.xlsx. Please add contractor data before proceeding.")
         sys.exit(1)
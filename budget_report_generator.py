@@ -13,12 +13,45 @@ import os
 import pandas as pd
 import numpy as np
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.utils.dataframe import dataframe_to_rows
 from openpyxl.utils import get_column_letter
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
 from openpyxl.chart import PieChart, Reference, BarChart
 from openpyxl.worksheet.table import Table, TableStyleInfo
+from utils.excel_handler import read_excel_cached
+
+# Columns the report reads from each source sheet
+BUDGET_COLUMNS = ["department", "fiscal_year", "project_id", "category",
+                  "allocation_date", "allocated_amount"]
+EXPENSE_COLUMNS = ["expense_id", "project_id", "department", "date", "category",
+                   "amount", "description", "recorded_by", "fiscal_year"]
+# Low-cardinality keys are read as categoricals so grouping works on codes
+KEY_DTYPES = {"department": "category", "category": "category",
+              "fiscal_year": "category"}
+
+# Background writer for generate_budget_report_async
+SAVE_EXECUTOR = ThreadPoolExecutor(max_workers=1)
+
+# Excel number format for amounts written as numeric cells
+CURRENCY_FORMAT = '"$"#,##0.00'
+
+# Shared cell styles, created once so every cell reuses the same style entry
+HEADER_FILL = PatternFill(start_color="DDEBF7", end_color="DDEBF7", fill_type="solid")
+TOTAL_FILL = PatternFill(start_color="F2F2F2", end_color="F2F2F2", fill_type="solid")
+OVERRUN_FILL = PatternFill(start_color="FFD9D9", end_color="FFD9D9", fill_type="solid")
+LOW_FILL = PatternFill(start_color="FFEB9C", end_color="FFEB9C", fill_type="solid")
+BOLD_FONT = Font(bold=True)
+OVERRUN_FONT = Font(color="9C0006")
+LOW_FONT = Font(color="9C5700")
+OVERRUN_ISSUE_FONT = Font(bold=True, color="9C0006")
+LOW_ISSUE_FONT = Font(bold=True, color="9C5700")
+TITLE_FONT = Font(size=16, bold=True)
+SECTION_FONT = Font(size=14, bold=True)
+CENTER_ALIGNMENT = Alignment(horizontal='center')
+LEFT_ALIGNMENT = Alignment(horizontal='left')
 
 def format_currency(amount):
     """Format amount as currency string."""
@@ -26,9 +59,35 @@ def format_currency(amount):
         return "$0.00"
     return f"${float(amount):.2f}"
 
-def generate_budget_report(output_path=None, fiscal_year=None):
+def styled_row(ws, values, font=None, fill=None, currency_cols=()):
     """
-    Generate a comprehensive budget report with multiple sheets.
+    Build a row of write-only cells sharing the same font and fill.
+    
+    Args:
+        ws: Write-only worksheet the row will be appended to
+        values (list): Cell values in column order
+        font (Font): Font applied to every cell, if given
+        fill (PatternFill): Fill applied to every cell, if given
+        currency_cols (tuple): Positions of numeric amounts to show as currency
+    
+    Returns:
+        list: WriteOnlyCell objects ready for ws.append()
+    """
+    cells = []
+    for value in values:
+        cell = WriteOnlyCell(ws, value=value)
+        if font is not None:
+            cell.font = font
+        if fill is not None:
+            cell.fill = fill
+        cells.append(cell)
+    for col in currency_cols:
+        cells[col].number_format = CURRENCY_FORMAT
+    return cells
+
+def build_budget_report(output_path=None, fiscal_year=None):
+    """
+    Build the budget report workbook in memory without saving it.
     
     Args:
         output_path (str): Path where the report will be saved
@@ -36,7 +95,7 @@ def generate_budget_report(output_path=None, fiscal_year=None):
                           If None, latest fiscal year will be used
     
     Returns:
-        str: Path to the generated report
+        tuple: (workbook, output_path) ready for save_budget_report()
     """
     # Set default output path if not provided
     if output_path is None:
@@ -45,9 +104,23 @@ def generate_budget_report(output_path=None, fiscal_year=None):
         os.makedirs(output_dir, exist_ok=True)
         output_path = f"{output_dir}/budget_report_{timestamp}.xlsx"
     
-    # Load data
-    budget_df = pd.read_excel("data/budget_allocations.xlsx", sheet_name="Allocations")
-    expenses_df = pd.read_excel("data/expenses.xlsx", sheet_name="Expenses")
+    # Load data; the two workbooks are independent, so read them concurrently
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        budget_future = executor.submit(read_excel_cached, "data/budget_allocations.xlsx",
+                                        sheet_name="Allocations", usecols=BUDGET_COLUMNS,
+                                        dtype=KEY_DTYPES)
+        expenses_future = executor.submit(read_excel_cached, "data/expenses.xlsx",
+                                          sheet_name="Expenses", dtype=KEY_DTYPES)
+        budget_df = budget_future.result()
+        expenses_df = expenses_future.result()
+    
+    # recorded_by is optional in older expense sheets, so keep whichever
+    # report columns the sheet actually has
+    expenses_df = expenses_df[expenses_df.columns.intersection(EXPENSE_COLUMNS, sort=False)]
+    
+    # Missing amounts count as zero, so amount cells can be written as numbers
+    budget_df["allocated_amount"] = budget_df["allocated_amount"].fillna(0)
+    expenses_df["amount"] = expenses_df["amount"].fillna(0)
     
     # Determine fiscal year if not provided
     if fiscal_year is None and not budget_df.empty:
@@ -64,43 +137,70 @@ def generate_budget_report(output_path=None, fiscal_year=None):
     if budget_df.empty:
         raise ValueError("No budget allocations found for the specified fiscal year")
     
-    # Create workbook
-    wb = Workbook()
-    
-    # Remove default sheet and create our sheets
-    default_sheet = wb.active
-    wb.remove(default_sheet)
+    # Order allocations by department once; the Details and Alerts sheets
+    # walk departments in this order, keeping allocation order within each
+    budget_df = budget_df.sort_values("department", kind="mergesort")
+    
+    # Spent, remaining and status per project, computed once for all sheets
+    spent_per_project = expenses_df.groupby("project_id", sort=False)["amount"].sum()
+    budget_df = budget_df.assign(
+        spent=budget_df["project_id"].map(spent_per_project).fillna(0).astype("float64")
+    )
+    budget_df["remaining"] = budget_df["allocated_amount"] - budget_df["spent"]
+    budget_df["status"] = np.select(
+        [budget_df["remaining"] < 0,
+         budget_df["remaining"] == 0,
+         budget_df["remaining"] < 0.1 * budget_df["allocated_amount"]],
+        ["OVERRUN", "DEPLETED", "LOW"],
+        default="ACTIVE"
+    )
+    
+    # Alerts: overrun projects and those with under 10% remaining
+    overrun = budget_df["remaining"] < 0
+    alert_mask = overrun | (budget_df["remaining"] < 0.1 * budget_df["allocated_amount"])
+    alerts_df = budget_df[alert_mask].assign(
+        issue=np.where(overrun[alert_mask], "BUDGET OVERRUN", "LOW BUDGET")
+    )
+    alerts_found = not alerts_df.empty
+    
+    # Create a write-only workbook; rows are streamed to each sheet in order
+    wb = Workbook(write_only=True)
     
     summary_sheet = wb.create_sheet("Summary")
     details_sheet = wb.create_sheet("Department Details")
     alerts_sheet = wb.create_sheet("Alerts")
     
+    # Column widths must be set before any rows are written
+    for col_idx in range(1, 9):
+        summary_sheet.column_dimensions[get_column_letter(col_idx)].width = 20 if col_idx == 1 else 15
+    for col_idx in range(1, 8):
+        details_sheet.column_dimensions[get_column_letter(col_idx)].width = 40 if col_idx == 6 else 15
+    for col_idx in range(1, 6):
+        alerts_sheet.column_dimensions[get_column_letter(col_idx)].width = 40 if col_idx == 5 else 15
+    
     # ============ POPULATE SUMMARY SHEET ============
     
     # Add title
-    summary_sheet.merge_cells('A1:H1')
-    title_cell = summary_sheet['A1']
-    title_cell.value = f"Budget Summary Report - Fiscal Year {fiscal_year}"
-    title_cell.font = Font(size=16, bold=True)
-    title_cell.alignment = Alignment(horizontal='center')
-    
-    # Create summary data by department
-    summary_data = []
+    summary_sheet.merged_cells.add('A1:H1')
+    title_cell = WriteOnlyCell(summary_sheet, value=f"Budget Summary Report - Fiscal Year {fiscal_year}")
+    title_cell.font = TITLE_FONT
+    title_cell.alignment = CENTER_ALIGNMENT
+    summary_sheet.append([title_cell])
     
     # Group budget data by department
-    dept_summary = budget_df.groupby("department").agg({
+    dept_summary = budget_df.groupby("department", observed=True).agg({
         "allocated_amount": "sum",
     }).reset_index()
     
     # Add spent amount from expenses
     if not expenses_df.empty:
-        dept_expenses = expenses_df.groupby("department").agg({
+        dept_expenses = expenses_df.groupby("department", observed=True).agg({
             "amount": "sum"
         }).reset_index().rename(columns={"amount": "spent_amount"})
         
         # Merge with dept_summary
         dept_summary = pd.merge(dept_summary, dept_expenses, 
-                               on="department", how="left").fillna(0)
+                               on="department", how="left").fillna({"spent_amount": 0})
     else:
         dept_summary["spent_amount"] = 0
     
@@ -111,71 +211,73 @@ def generate_budget_report(output_path=None, fiscal_year=None):
                             np.where(dept_summary["remaining_amount"] == 0, "DEPLETED",
                             np.where(dept_summary["percent_used"] > 90, "LOW", "ACTIVE")))
     
+    # Department rows sit between the header (row 2) and the TOTAL row
+    last_dept_row = len(dept_summary) + 2
+    
     # Add totals row
+    alloc_total = dept_summary["allocated_amount"].sum()
+    spent_total = dept_summary["spent_amount"].sum()
     totals = pd.DataFrame({
         "department": ["TOTAL"],
-        "allocated_amount": [dept_summary["allocated_amount"].sum()],
-        "spent_amount": [dept_summary["spent_amount"].sum()],
-        "remaining_amount": [dept_summary["allocated_amount"].sum() - dept_summary["spent_amount"].sum()],
-        "percent_used": [(dept_summary["spent_amount"].sum() / dept_summary["allocated_amount"].sum()) * 100 
-                          if dept_summary["allocated_amount"].sum() > 0 else 0],
+        "allocated_amount": [alloc_total],
+        "spent_amount": [spent_total],
+        "remaining_amount": [alloc_total - spent_total],
+        "percent_used": [(spent_total / alloc_total) * 100 if alloc_total > 0 else 0],
         "status": [""]
     })
     
     dept_summary = pd.concat([dept_summary, totals])
     
-    # Write summary table to sheet
-    summary_sheet.append(["Department", "Allocated", "Spent", "Remaining", "% Used", "Status"])
+    # Header row; its first cell links to Department Details and, when
+    # there are alerts, its last cell links to the Alerts sheet
+    header_row = styled_row(summary_sheet, ["Department", "Allocated", "Spent", "Remaining", "% Used", "Status"],
+                            font=BOLD_FONT, fill=HEADER_FILL)
+    header_row[0].hyperlink = f"#{details_sheet.title}!A1"
+    header_row[0].style = "Hyperlink"
+    if alerts_found:
+        header_row[5].hyperlink = f"#{alerts_sheet.title}!A1"
+        header_row[5].style = "Hyperlink"
+    summary_sheet.append(header_row)
     
-    for index, row in dept_summary.iterrows():
+    for row in dept_summary.itertuples(index=False):
         formatted_row = [
-            row["department"],
-            format_currency(row["allocated_amount"]),
-            format_currency(row["spent_amount"]),
-            format_currency(row["remaining_amount"]),
-            f"{row['percent_used']:.1f}%" if not pd.isna(row['percent_used']) else "0.0%",
-            row["status"]
+            row.department,
+            row.allocated_amount,
+            row.spent_amount,
+            row.remaining_amount,
+            f"{row.percent_used:.1f}%" if not pd.isna(row.percent_used) else "0.0%",
+            row.status
         ]
-        summary_sheet.append(formatted_row)
-    
-    # Style header row
-    for cell in summary_sheet[2]:
-        cell.font = Font(bold=True)
-        cell.fill = PatternFill(start_color="DDEBF7", end_color="DDEBF7", fill_type="solid")
         
-    # Style the data - conditional formatting
-    for row_idx, row in enumerate(summary_sheet.iter_rows(min_row=3, max_row=3+len(dept_summary)-1), 3):
         # Format department totals row
-        if row[0].value == "TOTAL":
-            for cell in row:
-                cell.font = Font(bold=True)
-                cell.fill = PatternFill(start_color="F2F2F2", end_color="F2F2F2", fill_type="solid")
-        else:
-            # Format status cell
-            status_cell = row[5]
-            if status_cell.value == "OVERRUN":
-                status_cell.fill = PatternFill(start_color="FFD9D9", end_color="FFD9D9", fill_type="solid")
-                status_cell.font = Font(color="9C0006")
-            elif status_cell.value == "LOW":
-                status_cell.fill = PatternFill(start_color="FFEB9C", end_color="FFEB9C", fill_type="solid")
-                status_cell.font = Font(color="9C5700")
-            
-            # Format remaining amount
-            remaining_cell = row[3]
-            amount_str = remaining_cell.value.replace("$", "").replace(",", "")
-            try:
-                if float(amount_str) < 0:
-                    remaining_cell.font = Font(color="9C0006")
-            except ValueError:
-                pass
+        if row.department == "TOTAL":
+            summary_sheet.append(styled_row(summary_sheet, formatted_row, font=BOLD_FONT, fill=TOTAL_FILL,
+                                            currency_cols=(1, 2, 3)))
+            continue
+        
+        cells = styled_row(summary_sheet, formatted_row, currency_cols=(1, 2, 3))
+        
+        # Format status cell
+        if row.status == "OVERRUN":
+            cells[5].fill = OVERRUN_FILL
+            cells[5].font = OVERRUN_FONT
+        elif row.status == "LOW":
+            cells[5].fill = LOW_FILL
+            cells[5].font = LOW_FONT
+        
+        # Format remaining amount
+        if row.remaining_amount < 0:
+            cells[3].font = OVERRUN_FONT
+        
+        summary_sheet.append(cells)
     
     # Add chart - Budget Allocation by Department
     chart1 = PieChart()
     chart1.title = "Budget Allocation by Department"
     
-    # Data for chart
-    data = Reference(summary_sheet, min_col=2, min_row=2, max_row=len(dept_summary)+1)
-    cats = Reference(summary_sheet, min_col=1, min_row=3, max_row=len(dept_summary))
+    # Data for chart: numeric department rows only, excluding the TOTAL row
+    data = Reference(summary_sheet, min_col=2, min_row=2, max_row=last_dept_row)
+    cats = Reference(summary_sheet, min_col=1, min_row=3, max_row=last_dept_row)
     chart1.add_data(data, titles_from_data=True)
     chart1.set_categories(cats)
     
@@ -189,252 +291,199 @@ def generate_budget_report(output_path=None, fiscal_year=None):
     chart2.type = "col"
     chart2.grouping = "stacked"
     
-    data = Reference(summary_sheet, min_col=3, min_row=2, max_col=4, max_row=len(dept_summary)+1)
-    cats = Reference(summary_sheet, min_col=1, min_row=3, max_row=len(dept_summary))
+    data = Reference(summary_sheet, min_col=3, min_row=2, max_col=4, max_row=last_dept_row)
     chart2.add_data(data, titles_from_data=True)
     chart2.set_categories(cats)
     
     # Add chart to sheet
     summary_sheet.add_chart(chart2, "I18")
     
-    # Set column widths
-    for col_idx, column in enumerate(summary_sheet.columns, 1):
-        column_width = 15  # default width
-        if col_idx == 1:  # Department column
-            column_width = 20
-        summary_sheet.column_dimensions[get_column_letter(col_idx)].width = column_width
-    
     # ============ POPULATE DEPARTMENT DETAILS SHEET ============
     
     # Add title
-    details_sheet.merge_cells('A1:G1')
-    title_cell = details_sheet['A1']
-    title_cell.value = "Department Budget Details"
-    title_cell.font = Font(size=16, bold=True)
-    title_cell.alignment = Alignment(horizontal='center')
-    
-    # For each department, add a section with budget and expenses
-    row_idx = 3
-    
-    for dept in budget_df["department"].unique():
-        # Department header
-        details_sheet.merge_cells(f'A{row_idx}:G{row_idx}')
-        dept_cell = details_sheet[f'A{row_idx}']
-        dept_cell.value = f"Department: {dept}"
-        dept_cell.font = Font(size=14, bold=True)
-        dept_cell.alignment = Alignment(horizontal='left')
-        
+    details_sheet.merged_cells.add('A1:G1')
+    title_cell = WriteOnlyCell(details_sheet, value="Department Budget Details")
+    title_cell.font = TITLE_FONT
+    title_cell.alignment = CENTER_ALIGNMENT
+    details_sheet.append([title_cell])
+    
+    # For each department, add a section with budget and expenses.
+    # Rows are streamed, so row_idx tracks the last row written for the
+    # merged section headers.
+    row_idx = 1
+    
+    expenses_by_dept = dict(iter(expenses_df.groupby("department", observed=True, sort=False)))
+    
+    for dept, dept_budget in budget_df.groupby("department", observed=True, sort=False):
+        # Department header, after a blank row
+        dept_cell = WriteOnlyCell(details_sheet, value=f"Department: {dept}")
+        dept_cell.font = SECTION_FONT
+        dept_cell.alignment = LEFT_ALIGNMENT
+        details_sheet.append([])
+        details_sheet.append([dept_cell])
         row_idx += 2
+        details_sheet.merged_cells.add(f'A{row_idx}:G{row_idx}')
         
         # Budget allocations for this department
-        dept_budget = budget_df[budget_df["department"] == dept]
-        
-        details_sheet.merge_cells(f'A{row_idx}:G{row_idx}')
-        budget_header = details_sheet[f'A{row_idx}']
-        budget_header.value = "Budget Allocations"
-        budget_header.font = Font(bold=True)
-        budget_header.fill = PatternFill(start_color="DDEBF7", end_color="DDEBF7", fill_type="solid")
-        
-        row_idx += 1
+        details_sheet.append([])
+        details_sheet.append(styled_row(details_sheet, ["Budget Allocations"], font=BOLD_FONT, fill=HEADER_FILL))
+        row_idx += 2
+        details_sheet.merged_cells.add(f'A{row_idx}:G{row_idx}')
         
         # Budget headers
         budget_columns = ["Project ID", "Category", "Allocation Date", "Allocated Amount", 
                          "Spent Amount", "Remaining", "Status"]
-        details_sheet.append(budget_columns)
-        
-        # Style header row
-        for cell in details_sheet[row_idx]:
-            cell.font = Font(bold=True)
-        
-        row_idx += 1
+        details_sheet.append(styled_row(details_sheet, budget_columns, font=BOLD_FONT))
         
         # Budget data
-        for _, budget_row in dept_budget.iterrows():
-            project_id = budget_row["project_id"]
-            
-            # Calculate spent amount for this project
-            spent = 0
-            if not expenses_df.empty:
-                project_expenses = expenses_df[expenses_df["project_id"] == project_id]
-                spent = project_expenses["amount"].sum() if not project_expenses.empty else 0
-                
-            remaining = float(budget_row["allocated_amount"]) - spent
-            
-            # Determine status
-            if remaining < 0:
-                status = "OVERRUN"
-            elif remaining == 0:
-                status = "DEPLETED"
-            elif remaining < (0.1 * float(budget_row["allocated_amount"])):
-                status = "LOW"
-            else:
-                status = "ACTIVE"
-                
-            details_sheet.append([
-                project_id,
-                budget_row["category"],
-                budget_row["allocation_date"],
-                format_currency(budget_row["allocated_amount"]),
-                format_currency(spent),
-                format_currency(remaining),
-                status
-            ])
+        for budget_row in dept_budget.itertuples(index=False):
+            cells = styled_row(details_sheet, [
+                budget_row.project_id,
+                budget_row.category,
+                budget_row.allocation_date,
+                budget_row.allocated_amount,
+                budget_row.spent,
+                budget_row.remaining,
+                budget_row.status
+            ], currency_cols=(3, 4, 5))
             
             # Style status cell
-            status_cell = details_sheet.cell(row=row_idx, column=7)
-            if status == "OVERRUN":
-                status_cell.fill = PatternFill(start_color="FFD9D9", end_color="FFD9D9", fill_type="solid")
-                status_cell.font = Font(color="9C0006")
-            elif status == "LOW":
-                status_cell.fill = PatternFill(start_color="FFEB9C", end_color="FFEB9C", fill_type="solid")
-                status_cell.font = Font(color="9C5700")
+            if budget_row.status == "OVERRUN":
+                cells[6].fill = OVERRUN_FILL
+                cells[6].font = OVERRUN_FONT
+            elif budget_row.status == "LOW":
+                cells[6].fill = LOW_FILL
+                cells[6].font = LOW_FONT
             
-            row_idx += 1
+            details_sheet.append(cells)
         
-        row_idx += 2
+        details_sheet.append([])
+        details_sheet.append([])
+        row_idx += len(dept_budget) + 3
         
         # Expenses for this department
-        dept_expenses = expenses_df[expenses_df["department"] == dept]
+        dept_expenses = expenses_by_dept.get(dept)
         
-        if not dept_expenses.empty:
-            details_sheet.merge_cells(f'A{row_idx}:G{row_idx}')
-            exp_header = details_sheet[f'A{row_idx}']
-            exp_header.value = "Expense Transactions"
-            exp_header.font = Font(bold=True)
-            exp_header.fill = PatternFill(start_color="DDEBF7", end_color="DDEBF7", fill_type="solid")
-            
+        if dept_expenses is not None:
+            details_sheet.append(styled_row(details_sheet, ["Expense Transactions"], font=BOLD_FONT, fill=HEADER_FILL))
             row_idx += 1
+            details_sheet.merged_cells.add(f'A{row_idx}:G{row_idx}')
             
             # Expense headers
             expense_columns = ["Expense ID", "Project ID", "Date", "Category", 
                               "Amount", "Description", "Recorded By"]
-            details_sheet.append(expense_columns)
-            
-            # Style header row
-            for cell in details_sheet[row_idx]:
-                cell.font = Font(bold=True)
-            
-            row_idx += 1
+            details_sheet.append(styled_row(details_sheet, expense_columns, font=BOLD_FONT))
             
             # Expense data
-            for _, expense_row in dept_expenses.iterrows():
-                details_sheet.append([
-                    expense_row["expense_id"],
-                    expense_row["project_id"],
-                    expense_row["date"],
-                    expense_row["category"],
-                    format_currency(expense_row["amount"]),
-                    expense_row["description"],
-                    expense_row["recorded_by"] if "recorded_by" in expense_row else ""
-                ])
-                row_idx += 1
+            for expense_row in dept_expenses.itertuples(index=False):
+                details_sheet.append(styled_row(details_sheet, [
+                    expense_row.expense_id,
+                    expense_row.project_id,
+                    expense_row.date,
+                    expense_row.category,
+                    expense_row.amount,
+                    expense_row.description,
+                    getattr(expense_row, "recorded_by", "")
+                ], currency_cols=(4,)))
+            
+            row_idx += len(dept_expenses) + 1
         
-        row_idx += 2
-    
-    # Set column widths
-    for col_idx, column in enumerate(details_sheet.columns, 1):
-        column_width = 15  # default width
-        if col_idx == 6:  # Description column
-            column_width = 40
-        details_sheet.column_dimensions[get_column_letter(col_idx)].width = column_width
+        details_sheet.append([])
+        row_idx += 1
     
     # ============ POPULATE ALERTS SHEET ============
     
     # Add title
-    alerts_sheet.merge_cells('A1:E1')
-    title_cell = alerts_sheet['A1']
-    title_cell.value = "Budget Alerts and Warnings"
-    title_cell.font = Font(size=16, bold=True)
-    title_cell.alignment = Alignment(horizontal='center')
-    
-    row_idx = 3
-    alerts_sheet.append(["Department", "Project ID", "Category", "Issue", "Details"])
-    
-    # Style header row
-    for cell in alerts_sheet[row_idx]:
-        cell.font = Font(bold=True)
-        cell.fill = PatternFill(start_color="DDEBF7", end_color="DDEBF7", fill_type="solid")
-    
-    row_idx += 1
-    alerts_found = False
-    
-    # Check for overruns and low budget
-    for dept in budget_df["department"].unique():
-        dept_budget = budget_df[budget_df["department"] == dept]
+    alerts_sheet.merged_cells.add('A1:E1')
+    title_cell = WriteOnlyCell(alerts_sheet, value="Budget Alerts and Warnings")
+    title_cell.font = TITLE_FONT
+    title_cell.alignment = CENTER_ALIGNMENT
+    alerts_sheet.append([title_cell])
+    alerts_sheet.append([])
+    
+    alerts_sheet.append(styled_row(alerts_sheet, ["Department", "Project ID", "Category", "Issue", "Details"],
+                                   font=BOLD_FONT, fill=HEADER_FILL))
+    
+    for alert in alerts_df.itertuples(index=False):
+        allocated = float(alert.allocated_amount)
+        if alert.issue == "BUDGET OVERRUN":
+            details = (f"Allocated: {format_currency(allocated)}, Spent: {format_currency(alert.spent)}, " +
+                       f"Overrun: {format_currency(abs(alert.remaining))}")
+            fill, issue_font = OVERRUN_FILL, OVERRUN_ISSUE_FONT
+        else:
+            details = (f"Allocated: {format_currency(allocated)}, Spent: {format_currency(alert.spent)}, " +
+                       f"Remaining: {format_currency(alert.remaining)} ({alert.remaining/allocated*100:.1f}%)")
+            fill, issue_font = LOW_FILL, LOW_ISSUE_FONT
         
-        for _, budget_row in dept_budget.iterrows():
-            project_id = budget_row["project_id"]
-            allocated = float(budget_row["allocated_amount"])
-            
-            # Calculate spent amount
-            spent = 0
-            if not expenses_df.empty:
-                project_expenses = expenses_df[expenses_df["project_id"] == project_id]
-                spent = project_expenses["amount"].sum() if not project_expenses.empty else 0
-                
-            remaining = allocated - spent
-            
-            # Check for issues
-            if remaining < 0:
-                alerts_sheet.append([
-                    dept,
-                    project_id,
-                    budget_row["category"],
-                    "BUDGET OVERRUN",
-                    f"Allocated: {format_currency(allocated)}, Spent: {format_currency(spent)}, " +
-                    f"Overrun: {format_currency(abs(remaining))}"
-                ])
-                # Style this row
-                for cell in alerts_sheet[row_idx]:
-                    cell.fill = PatternFill(start_color="FFD9D9", end_color="FFD9D9", fill_type="solid")
-                alerts_sheet.cell(row=row_idx, column=4).font = Font(bold=True, color="9C0006")
-                row_idx += 1
-                alerts_found = True
-                
-            elif remaining < (0.1 * allocated):
-                alerts_sheet.append([
-                    dept,
-                    project_id,
-                    budget_row["category"],
-                    "LOW BUDGET",
-                    f"Allocated: {format_currency(allocated)}, Spent: {format_currency(spent)}, " +
-                    f"Remaining: {format_currency(remaining)} ({remaining/allocated*100:.1f}%)"
-                ])
-                # Style this row
-                for cell in alerts_sheet[row_idx]:
-                    cell.fill = PatternFill(start_color="FFEB9C", end_color="FFEB9C", fill_type="solid")
-                alerts_sheet.cell(row=row_idx, column=4).font = Font(bold=True, color="9C5700")
-                row_idx += 1
-                alerts_found = True
-    
-    # Check for inactive budgets (no expenses for 90+ days)
+        cells = styled_row(alerts_sheet, [
+            alert.department,
+            alert.project_id,
+            alert.category,
+            alert.issue,
+            details
+        ], fill=fill)
+        cells[3].font = issue_font
+        alerts_sheet.append(cells)
+    
     if not alerts_found:
         alerts_sheet.append(["No budget alerts found at this time."])
     
-    # Set column widths
-    for col_idx, column in enumerate(alerts_sheet.columns, 1):
-        column_width = 15  # default width
-        if col_idx == 5:  # Details column
-            column_width = 40
-        alerts_sheet.column_dimensions[get_column_letter(col_idx)].width = column_width
-    
-    # Add hyperlinks between sheets for easy navigation
-    # Link from Summary to Department Details
-    summary_sheet['A2'].hyperlink = f"#{details_sheet.title}!A1"
-    summary_sheet['A2'].style = "Hyperlink"
+    return wb, output_path
+
+
+def save_budget_report(wb, output_path):
+    """
+    Save a built budget report workbook.
     
-    # Link from Summary to Alerts
-    if alerts_found:
-        summary_sheet.cell(row=2, column=6).hyperlink = f"#{alerts_sheet.title}!A1"
-        summary_sheet.cell(row=2, column=6).style = "Hyperlink"
+    Args:
+        wb (openpyxl.Workbook): Workbook returned by build_budget_report()
+        output_path (str): Path where the report will be saved
     
-    # Save workbook
+    Returns:
+        str: Path to the saved report
+    """
     wb.save(output_path)
     print(f"Budget report saved to: {output_path}")
     
     return output_path
 
 
+def generate_budget_report(output_path=None, fiscal_year=None):
+    """
+    Generate a comprehensive budget report with multiple sheets.
+    
+    Args:
+        output_path (str): Path where the report will be saved
+        fiscal_year (str): Fiscal year to filter data (YYYY-YYYY format)
+                          If None, latest fiscal year will be used
+    
+    Returns:
+        str: Path to the generated report
+    """
+    wb, output_path = build_budget_report(output_path, fiscal_year)
+    return save_budget_report(wb, output_path)
+
+
+def generate_budget_report_async(output_path=None, fiscal_year=None):
+    """
+    Generate a budget report, saving the workbook in the background.
+    
+    The data is loaded and the workbook built before this returns, so
+    errors such as missing allocations are still raised here. Saves run
+    one at a time on a shared worker thread.
+    
+    Args:
+        output_path (str): Path where the report will be saved
+        fiscal_year (str): Fiscal year to filter data (YYYY-YYYY format)
+                          If None, latest fiscal year will be used
+    
+    Returns:
+        concurrent.futures.Future: Resolves to the report path once saved
+    """
+    wb, output_path = build_budget_report(output_path, fiscal_year)
+    return SAVE_EXECUTOR.submit(save_budget_report, wb, output_path)
+
+
 if __name__ == "__main__":
     import argparse
     
@@ -2,61 +2,76 @@
 
 import os
 import sys
+import csv
 import argparse
 import datetime
 from pathlib import Path
 
 # Local imports
-from utils.excel_handler import load_workbook, save_workbook
+from utils.excel_handler import load_workbook, save_workbook, migrate_log_to_csv
 
 # Constants
 ASSETS_PATH = 'data/assets.xlsx'
-LOG_PATH = 'data/asset_log.xlsx'
+LOG_PATH = 'data/asset_log.csv'
+# Earlier versions kept the log in a workbook; it seeds the CSV on first use
+LEGACY_LOG_PATH = 'data/asset_log.xlsx'
 LOG_HEADERS = ['Timestamp', 'Asset ID', 'Asset Type', 'Action', 'Details']
 
-def find_asset(asset_id):
+def locate_asset(wb, asset_id):
     """
-    Find an asset by ID in the assets workbook.
+    Find an asset by ID in an already loaded assets workbook.
     
     Args:
+        wb (openpyxl.Workbook): The assets workbook to search
         asset_id (str): The asset ID to search for
         
     Returns:
         tuple: (sheet_name, row_index, asset_data) if found, (None, None, None) otherwise
     """
-    # Check if assets file exists
-    if not os.path.exists(ASSETS_PATH):
-        print(f"Error: Assets file not found at {ASSETS_PATH}")
-        return None, None, None
-    
-    # Load the workbook
-    wb = load_workbook(ASSETS_PATH)
-    
     # Search through all sheets
     for sheet_name in wb.sheetnames:
         ws = wb[sheet_name]
+        rows = ws.iter_rows(values_only=True)
         
         # Find the ID column (assumed to be the first column)
-        header_row = [cell.value for cell in ws[1]]
+        header_row = list(next(rows, ()))
         if 'ID' not in header_row:
             continue
         
-        id_col_idx = header_row.index('ID') + 1  # Convert to 1-based index
+        id_col_idx = header_row.index('ID')
         
-        # Search for the asset ID
-        for row_idx in range(2, ws.max_row + 1):  # Start from row 2 (skip header)
-            cell_value = ws.cell(row=row_idx, column=id_col_idx).value
-            if str(cell_value) == str(asset_id):
+        # Search for the asset ID, starting from row 2 (skip header)
+        for row_idx, row in enumerate(rows, start=2):
+            if str(row[id_col_idx]) == str(asset_id):
                 # Found the asset, collect its data
-                asset_data = {}
-                for col_idx, header in enumerate(header_row, 1):
-                    asset_data[header] = ws.cell(row=row_idx, column=col_idx).value
-                
+                asset_data = dict(zip(header_row, row))
                 return sheet_name, row_idx, asset_data
     
     # Asset not found
     return None, None, None
 
+def find_asset(asset_id):
+    """
+    Find an asset by ID in the assets workbook.
+    
+    Args:
+        asset_id (str): The asset ID to search for
+        
+    Returns:
+        tuple: (sheet_name, row_index, asset_data) if found, (None, None, None) otherwise
+    """
+    # Check if assets file exists
+    if not os.path.exists(ASSETS_PATH):
+        print(f"Error: Assets file not found at {ASSETS_PATH}")
+        return None, None, None
+    
+    # Load the workbook read-only; the search only needs cell values
+    wb = load_workbook(ASSETS_PATH, read_only=True, data_only=True)
+    try:
+        return locate_asset(wb, asset_id)
+    finally:
+        wb.close()
+
 def delete_asset(asset_id, confirm=True):
     """
     Delete an asset by ID and log the deletion.
@@ -68,8 +83,14 @@ def delete_asset(asset_id, confirm=True):
     Returns:
         bool: True if deletion was successful, False otherwise
     """
-    # Find the asset
-    sheet_name, row_idx, asset_data = find_asset(asset_id)
+    # Check if assets file exists
+    if not os.path.exists(ASSETS_PATH):
+        print(f"Error: Assets file not found at {ASSETS_PATH}")
+        return False
+    
+    # Load the workbook once; the same copy is searched and then edited
+    wb = load_workbook(ASSETS_PATH)
+    sheet_name, row_idx, asset_data = locate_asset(wb, asset_id)
     
     if not sheet_name:
         print(f"Error: Asset with ID '{asset_id}' not found.")
@@ -88,12 +109,8 @@ def delete_asset(asset_id, confirm=True):
             return False
     
     try:
-        # Load the workbook and get the sheet
-        wb = load_workbook(ASSETS_PATH)
-        ws = wb[sheet_name]
-        
         # Remove the row
-        ws.delete_rows(row_idx, 1)
+        wb[sheet_name].delete_rows(row_idx, 1)
         
         # Save the updated workbook
         save_workbook(wb, ASSETS_PATH)
@@ -112,25 +129,17 @@ def log_deletion(asset_id, asset_type, asset_data):
     """
     Log the deletion action to the asset log file.
     
+    The log is a CSV file so each entry is a single append, however
+    long the log grows.
+    
     Args:
         asset_id (str): The deleted asset ID
         asset_type (str): The type of asset (sheet name)
         asset_data (dict): The data of the deleted asset
     """
-    # Ensure log file exists
-    if not os.path.exists(LOG_PATH):
-        # Create the log file with headers
-        from openpyxl import Workbook
-        log_wb = Workbook()
-        log_ws = log_wb.active
-        log_ws.title = "Asset Log"
-        for col_idx, header in enumerate(LOG_HEADERS, start=1):
-            log_ws.cell(row=1, column=col_idx, value=header)
-        log_wb.save(LOG_PATH)
-    
-    # Load the log workbook
-    log_wb = load_workbook(LOG_PATH)
-    log_ws = log_wb.active
+    # Carry over the old workbook log, then write the header when starting a new log file
+    migrate_log_to_csv(LEGACY_LOG_PATH, LOG_PATH)
+    new_log = not os.path.exists(LOG_PATH)
     
     # Create log entry
     timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -139,12 +148,11 @@ def log_deletion(asset_id, asset_type, asset_data):
     log_entry = [timestamp, asset_id, asset_type, 'DELETE', details]
     
     # Append log entry
-    next_row = log_ws.max_row + 1
-    for col_idx, value in enumerate(log_entry, start=1):
-        log_ws.cell(row=next_row, column=col_idx, value=value)
-    
-    # Save the updated log
-    save_workbook(log_wb, LOG_PATH)
+    with open(LOG_PATH, 'a', newline='') as f:
+        writer = csv.writer(f)
+        if new_log:
+            writer.writerow(LOG_HEADERS)
+        writer.writerow(log_entry)
     
     print(f"Deletion logged in {LOG_PATH}")
 
@@ -50,31 +50,36 @@ def find_incident(file_path: str, incident_id: str) -> Tuple[bool, Optional[dict
         return False, None, None
     
     try:
-        wb = openpyxl.load_workbook(file_path)
+        # Read-only load: the search only needs cell values
+        wb = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
         
         # Check if the Incidents sheet exists
-        try:
-            ws = wb["Incidents"]
-        except KeyError:
+        if "Incidents" not in wb.sheetnames:
+            wb.close()
             # Sheet doesn't exist, create it
             logger.info(f"Incidents sheet not found in {file_path}, initializing structure")
             create_incident_sheet(file_path)
             print(f"No incidents found: Incidents tracking sheet was just initialized.")
             return False, None, None
-            
-        # Get column headers
-        headers = [cell.value for cell in ws[1]]
         
-        # Search for the incident ID in the first column
-        for row_idx, row in enumerate(ws.iter_rows(min_row=2), start=2):
-            if row[0].value == incident_id:
-                # Found the incident - create a dict of incident details
-                incident_details = {
-                    headers[i]: cell.value 
-                    for i, cell in enumerate(row) 
-                    if i < len(headers)
-                }
-                return True, incident_details, row_idx
+        try:
+            rows = wb["Incidents"].iter_rows(values_only=True)
+            
+            # Get column headers
+            headers = list(next(rows, ()))
+            
+            # Search for the incident ID in the first column
+            for row_idx, row in enumerate(rows, start=2):
+                if row and row[0] == incident_id:
+                    # Found the incident - create a dict of incident details
+                    incident_details = {
+                        headers[i]: value 
+                        for i, value in enumerate(row) 
+                        if i < len(headers)
+                    }
+                    return True, incident_details, row_idx
+        finally:
+            wb.close()
         
         # Incident not found
         return False, None, None
@@ -3,19 +3,31 @@
 import os
 import sys
 import argparse
-import pandas as pd
 import shutil
 from datetime import datetime
+from pathlib import Path
+import atexit
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
 from openpyxl import load_workbook
-import importlib.util
 
-# Configure logging
-logging.basicConfig(
-    filename='data/maintenance_deletion.log',
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
+# Configure logging; records are queued and written by a background listener
+log_queue = queue.Queue(-1)
+log_file_handler = logging.FileHandler('data/maintenance_deletion.log')
+log_file_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+log_listener = QueueListener(log_queue, log_file_handler, respect_handler_level=True)
+log_queue_handler = QueueHandler(log_queue)
+log_queue_handler.setFormatter(logging.Formatter('%(message)s'))
+log_listener.start()
+atexit.register(log_listener.stop)
+
+# Root logging may already be configured (e.g. by excel_handler), so attach
+# the queue to this script's logger directly instead of going through basicConfig
+logger = logging.getLogger('maintenance_deletion')
+logger.setLevel(logging.INFO)
+logger.addHandler(log_queue_handler)
+logger.propagate = False
 
 def backup_workbook(excel_path):
     """
@@ -29,18 +41,17 @@ def backup_workbook(excel_path):
     """
     # Create backups directory if it doesn't exist
     backup_dir = "data/backups"
-    if not os.path.exists(backup_dir):
-        os.makedirs(backup_dir)
+    Path(backup_dir).mkdir(parents=True, exist_ok=True)
     
     # Generate backup filename with timestamp
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     backup_filename = f"maintenance_history_backup_{timestamp}.xlsx"
     backup_path = os.path.join(backup_dir, backup_filename)
     
-    # Make the backup copy
-    shutil.copy2(excel_path, backup_path)
+    # Make the backup copy; file metadata is not needed for a timestamped backup
+    shutil.copyfile(excel_path, backup_path)
     print(f"Backup created at: {backup_path}")
-    logging.info(f"Backup created: {backup_path}")
+    logger.info(f"Backup created: {backup_path}")
     
     return backup_path
 
@@ -56,71 +67,96 @@ def verify_maintenance_sheet(excel_path):
         bool: True if sheet exists or was recreated, False if critical error
     """
     try:
-        # Try to load the workbook and check if the sheet exists
-        workbook = load_workbook(excel_path)
-        if "Maintenance History" not in workbook.sheetnames:
+        # Single read-only pass: sheet names and header row come from the same load
+        workbook = load_workbook(excel_path, read_only=True, data_only=True)
+        try:
+            sheet_exists = "Maintenance History" in workbook.sheetnames
+            if sheet_exists:
+                header = next(workbook["Maintenance History"].iter_rows(max_row=1, values_only=True), ())
+        finally:
+            workbook.close()
+
+        if not sheet_exists:
             print("Warning: 'Maintenance History' sheet not found in workbook.")
             
             # Create backup before attempting repair
             backup_path = backup_workbook(excel_path)
             print(f"Created backup at {backup_path} before attempting repair.")
             
-            # Try to import the excel_handler module
+            # Import the repair function only when needed; excel_handler pulls in pandas
+            try:
+                from utils.excel_handler import create_maintenance_history_sheet
+            except ImportError:
+                print("Error: create_maintenance_history_sheet() could not be imported from utils.excel_handler.")
+                logger.error("Function create_maintenance_history_sheet() not available")
+                return False
+            
             try:
-                # Dynamically import the excel_handler module
-                spec = importlib.util.spec_from_file_location(
-                    "excel_handler", 
-                    os.path.join("utils", "excel_handler.py")
-                )
-                excel_handler = importlib.util.module_from_spec(spec)
-                spec.loader.exec_module(excel_handler)
+                print("Attempting to recreate 'Maintenance History' sheet...")
                 
-                # Check if the function exists
-                if hasattr(excel_handler, 'create_maintenance_history_sheet'):
-                    print("Attempting to recreate 'Maintenance History' sheet...")
-                    
-                    # Call the function to recreate the sheet
-                    excel_handler.create_maintenance_history_sheet(excel_path)
-                    print("Successfully recreated 'Maintenance History' sheet with schema.")
-                    logging.info(f"Recreated 'Maintenance History' sheet in {excel_path}")
-                    
-                    # Return True since the sheet was recreated
-                    return True
-                else:
-                    print("Error: create_maintenance_history_sheet() function not found in excel_handler module.")
-                    logging.error("Function create_maintenance_history_sheet() not found")
-                    return False
-                    
+                # Call the function to recreate the sheet
+                create_maintenance_history_sheet(excel_path)
+                print("Successfully recreated 'Maintenance History' sheet with schema.")
+                logger.info(f"Recreated 'Maintenance History' sheet in {excel_path}")
+                
+                # Return True since the sheet was recreated
+                return True
+            
             except Exception as e:
-                print(f"Error importing excel_handler module or recreating sheet: {e}")
-                logging.error(f"Failed to import excel_handler or recreate sheet: {e}")
+                print(f"Error recreating sheet: {e}")
+                logger.error(f"Failed to recreate sheet: {e}")
                 return False
         
-        # Sheet exists, now verify it has at least the record_id column
-        workbook.close()  # Close before opening with pandas
-        
-        # Check sheet structure using pandas
-        df = pd.read_excel(excel_path, sheet_name="Maintenance History")
-        if 'record_id' not in df.columns:
+        # Sheet exists, now verify its header has at least the record_id column
+        if 'record_id' not in header:
             print("Error: 'Maintenance History' sheet exists but is missing the 'record_id' column.")
             print("Sheet structure appears to be invalid. Please check the file manually.")
-            logging.error("Invalid 'Maintenance History' sheet structure - missing record_id column")
+            logger.error("Invalid 'Maintenance History' sheet structure - missing record_id column")
             return False
             
         return True
         
     except Exception as e:
         print(f"Error verifying Maintenance History sheet: {e}")
-        logging.error(f"Error verifying maintenance sheet: {e}")
+        logger.error(f"Error verifying maintenance sheet: {e}")
         return False
 
-def delete_maintenance_record(record_id, force=False):
+def locate_record(ws, record_id):
+    """
+    Find a maintenance record by ID in the Maintenance History worksheet.
+    
+    Args:
+        ws (openpyxl.worksheet.worksheet.Worksheet): The Maintenance History sheet
+        record_id (str): ID of the record to find
+    
+    Returns:
+        tuple: (row_index, record_details) if found, (None, None) otherwise
+    """
+    rows = ws.iter_rows(values_only=True)
+    header = list(next(rows, ()))
+    if 'record_id' not in header:
+        return None, None
+    
+    id_col_idx = header.index('record_id')
+    target = str(record_id)
+    
+    # Stream data rows, starting from row 2 (skip header). Text ids compare
+    # directly; only numeric or other typed cells are converted to str.
+    for row_idx, row in enumerate(rows, start=2):
+        value = row[id_col_idx]
+        if value == target or (not isinstance(value, str) and str(value) == target):
+            return row_idx, dict(zip(header, row))
+    
+    return None, None
+
+def delete_maintenance_record(record_id, force=False, backup=True):
     """
     Delete a maintenance record by ID from the Excel workbook.
     
     Args:
         record_id (str): ID of the record to delete
         force (bool): Skip confirmation if True
+        backup (bool): Back up the workbook before deleting if True
     
     Returns:
         bool: True if successful, False otherwise
@@ -130,30 +166,29 @@ def delete_maintenance_record(record_id, force=False):
     # Check if file exists
     if not os.path.exists(excel_path):
         print(f"Error: {excel_path} not found.")
-        logging.error(f"File not found: {excel_path}")
+        logger.error(f"File not found: {excel_path}")
         return False
     
     # Verify Maintenance History sheet exists and has correct structure
     if not verify_maintenance_sheet(excel_path):
         print("Error: Cannot proceed with deletion due to issues with the Maintenance History sheet.")
         print("The workbook structure has been repaired if possible, but deletion has been aborted.")
-        logging.error(f"Deletion of record {record_id} aborted due to sheet structure issues")
+        logger.error(f"Deletion of record {record_id} aborted due to sheet structure issues")
         return False
     
     try:
-        # Load workbook into pandas dataframe
-        df = pd.read_excel(excel_path, sheet_name="Maintenance History")
+        # Locate the record with a streaming read-only scan
+        workbook = load_workbook(excel_path, read_only=True, data_only=True)
+        try:
+            row_idx, record_details = locate_record(workbook["Maintenance History"], record_id)
+        finally:
+            workbook.close()
         
-        # Check if record exists
-        record_exists = any(str(r_id) == str(record_id) for r_id in df['record_id'])
-        if not record_exists:
+        if row_idx is None:
             print(f"Error: Record ID {record_id} not found in maintenance history.")
-            logging.warning(f"Attempted to delete non-existent record ID: {record_id}")
+            logger.warning(f"Attempted to delete non-existent record ID: {record_id}")
             return False
         
-        # Get the record details for logging
-        record_details = df[df['record_id'].astype(str) == str(record_id)].iloc[0].to_dict()
-        
         # Confirm deletion if not forced
         if not force:
             print("\nRecord details:")
@@ -163,36 +198,32 @@ def delete_maintenance_record(record_id, force=False):
             confirmation = input(f"\nAre you sure you want to delete record {record_id}? (y/N): ")
             if confirmation.lower() not in ['y', 'yes']:
                 print("Deletion cancelled.")
-                logging.info(f"Deletion of record {record_id} cancelled by user")
+                logger.info(f"Deletion of record {record_id} cancelled by user")
                 return False
         
-        # Create backup before modifying
-        backup_path = backup_workbook(excel_path)
-        
-        # Remove the record
-        df_updated = df[df['record_id'].astype(str) != str(record_id)]
+        # Create backup before modifying, unless the caller opted out
+        backup_path = backup_workbook(excel_path) if backup else None
         
-        # Check if any record was actually removed
-        if len(df_updated) == len(df):
-            print(f"Warning: No record was deleted. Record ID may not match exactly.")
-            logging.warning(f"Failed to delete record {record_id} - no rows were removed")
-            return False
-        
-        # Save the updated dataframe back to Excel while preserving other sheets
-        with pd.ExcelWriter(excel_path, engine='openpyxl', mode='a', if_sheet_exists='replace') as writer:
-            df_updated.to_excel(writer, sheet_name="Maintenance History", index=False)
+        # Remove the single row in place, leaving the rest of the workbook untouched
+        workbook = load_workbook(excel_path)
+        try:
+            workbook["Maintenance History"].delete_rows(row_idx, 1)
+            workbook.save(excel_path)
+        finally:
+            workbook.close()
         
         # Log the deletion
         log_message = f"Deleted record ID {record_id}: {record_details}"
         print(f"Successfully deleted record ID {record_id}")
-        print(f"Backup created at: {backup_path}")
-        logging.info(log_message)
+        if backup_path:
+            print(f"Backup created at: {backup_path}")
+        logger.info(log_message)
         
         return True
     
     except Exception as e:
         print(f"Error deleting maintenance record: {e}")
-        logging.error(f"Error deleting record ID {record_id}: {e}")
+        logger.error(f"Error deleting record ID {record_id}: {e}")
         return False
 
 def main():
@@ -202,9 +233,10 @@ def main():
     parser = argparse.ArgumentParser(description="Delete a maintenance record from the history.")
     parser.add_argument("--record-id", required=True, help="ID of the record to delete")
     parser.add_argument("--force", action="store_true", help="Delete without confirmation")
+    parser.add_argument("--no-backup", action="store_true", help="Skip the workbook backup before deleting")
     
     args = parser.parse_args()
-    success = delete_maintenance_record(args.record_id, args.force)
+    success = delete_maintenance_record(args.record_id, args.force, backup=not args.no_backup)
     
     # Provide appropriate exit code for scripting purposes
     if not success:
@@ -4,22 +4,38 @@ import os
 import sys
 import pandas as pd
 import argparse
+import atexit
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
 import shutil
 from datetime import datetime
+from pathlib import Path
 
 # Add parent directory to path to import modules
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from utils.excel_handler import create_tasks_sheet
 
-# Configure logging
-logging.basicConfig(
-    filename="cityinfraxls.log",
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    datefmt="%Y-%m-%d %H:%M:%S"
-)
+# Configure logging; records are queued and written by a background listener
+log_queue = queue.Queue(-1)
+log_file_handler = logging.FileHandler("cityinfraxls.log")
+log_file_handler.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s", datefmt="%Y-%m-%d %H:%M:%S"))
+log_listener = QueueListener(log_queue, log_file_handler, respect_handler_level=True)
+log_queue_handler = QueueHandler(log_queue)
+log_queue_handler.setFormatter(logging.Formatter("%(message)s"))
+log_listener.start()
+atexit.register(log_listener.stop)
+
+# excel_handler has already configured the root logger, so attach the queue
+# to this script's logger directly instead of going through basicConfig
 logger = logging.getLogger("CityInfraXLS")
+logger.setLevel(logging.INFO)
+logger.addHandler(log_queue_handler)
+logger.propagate = False
+
+# Only the lookup key is forced to text so ids compare as strings; other
+# columns keep their inferred numeric/date types when the sheet is written back
+TASK_DTYPES = {"Task ID": str}
 
 def load_tasks():
     """Load tasks from tasks.xlsx, creating the file if it doesn't exist."""
@@ -34,7 +50,7 @@ def load_tasks():
                                     "Assigned At", "Status", "Status Updated At", "Details"])
     
     try:
-        tasks_df = pd.read_excel(tasks_file)
+        tasks_df = pd.read_excel(tasks_file, dtype=TASK_DTYPES, engine="openpyxl")
         return tasks_df
     except Exception as e:
         print(f"Error loading tasks: {e}")
@@ -45,8 +61,7 @@ def create_backup(file_path):
     """Create a timestamped backup of the given file."""
     # Create backups directory if it doesn't exist
     backup_dir = os.path.join(os.path.dirname(file_path), "backups")
-    if not os.path.exists(backup_dir):
-        os.makedirs(backup_dir)
+    Path(backup_dir).mkdir(parents=True, exist_ok=True)
     
     # Generate timestamp and backup filename
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -57,7 +72,7 @@ def create_backup(file_path):
     # Create backup if original file exists
     if os.path.exists(file_path):
         try:
-            shutil.copy2(file_path, backup_path)
+            shutil.copyfile(file_path, backup_path)
             logger.info(f"Created backup: {backup_path}")
             return backup_path
         except Exception as e:
@@ -78,8 +93,8 @@ def display_task(task_df):
         print(f"{col}: {value}")
     print("-" * 50)
 
-def delete_task(task_id, force=False):
-    """Delete a task from the tasks workbook."""
+def delete_task(task_id, force=False, backup=True):
+    """Delete a task from the tasks workbook, backing it up first unless backup is False."""
     tasks_file = "data/tasks.xlsx"
     
     # Load existing tasks
@@ -88,13 +103,17 @@ def delete_task(task_id, force=False):
         print("No tasks found.")
         return False
     
+    # Scan the Task ID column once; existence, display and removal reuse the match
+    matches = tasks_df.index[tasks_df['Task ID'] == task_id]
+    
     # Check if task exists
-    if task_id not in tasks_df['Task ID'].values:
+    if matches.empty:
         print(f"Error: Task ID {task_id} not found.")
         return False
     
     # Get task information for display
-    task_info = tasks_df[tasks_df['Task ID'] == task_id]
+    task_idx = matches[0]
+    task_info = tasks_df.loc[[task_idx]]
     display_task(task_info)
     
     # Confirm deletion if not forced
@@ -105,14 +124,14 @@ def delete_task(task_id, force=False):
             return False
     
     # Create backup before deletion
-    backup_file = create_backup(tasks_file)
-    if backup_file:
-        print(f"Backup created: {backup_file}")
+    if backup:
+        backup_file = create_backup(tasks_file)
+        if backup_file:
+            print(f"Backup created: {backup_file}")
     
     # Delete the task
     try:
-        # Get the index and delete
-        task_idx = tasks_df.index[tasks_df['Task ID'] == task_id].tolist()[0]
+        # Delete only the matched row
         tasks_df = tasks_df.drop(task_idx)
         
         # Save updated file
@@ -138,6 +157,7 @@ def main():
     parser = argparse.ArgumentParser(description="Delete a task from CityInfraXLS")
     parser.add_argument("--task-id", help="ID of the task to delete")
     parser.add_argument("--force", action="store_true", help="Skip confirmation prompt")
+    parser.add_argument("--no-backup", action="store_true", help="Skip the tasks file backup before deleting")
     args = parser.parse_args()
     
     # Load tasks
@@ -152,9 +172,15 @@ def main():
     # Get task ID from args or prompt user
     task_id = args.task_id
     if not task_id:
+        # Pull the listed columns out once instead of building a Series per row
+        ids = tasks_df['Task ID'].tolist()
+        missing = ['N/A'] * len(ids)
+        incidents = tasks_df['Incident ID'].tolist() if 'Incident ID' in tasks_df else missing
+        statuses = tasks_df['Status'].tolist() if 'Status' in tasks_df else missing
+        
         print("\nAvailable tasks:")
-        for idx, row in tasks_df.iterrows():
-            print(f"{idx+1}. Task ID: {row['Task ID']} - Incident ID: {row.get('Incident ID', 'N/A')} - Status: {row.get('Status', 'N/A')}")
+        for number, (tid, incident_id, status) in enumerate(zip(ids, incidents, statuses), start=1):
+            print(f"{number}. Task ID: {tid} - Incident ID: {incident_id} - Status: {status}")
         
         while True:
             try:
@@ -162,15 +188,15 @@ def main():
                 if choice == 0:
                     print("Task deletion cancelled.")
                     sys.exit(0)
-                if 1 <= choice <= len(tasks_df):
-                    task_id = tasks_df.iloc[choice-1]['Task ID']
+                if 1 <= choice <= len(ids):
+                    task_id = ids[choice-1]
                     break
                 print("Invalid choice. Please try again.")
             except ValueError:
                 print("Please enter a valid number.")
     
     # Delete the task
-    success = delete_task(task_id, args.force)
+    success = delete_task(task_id, args.force, backup=not args.no_backup)
     if not success:
         sys.exit(1)
 
@@ -8,14 +8,36 @@ assigns a unique expense ID, and records the expense in the expense tracker shee
 """
 
 import os
-import json
 import argparse
 import datetime
 import uuid
 from decimal import Decimal, InvalidOperation
-import pandas as pd
-from openpyxl import load_workbook
-from utils.excel_handler import create_sheets_from_schema, load_workbook, save_workbook
+import openpyxl
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+from utils.excel_handler import load_workbook, read_excel_cached, save_workbook
+
+# Expense tracker columns, in sheet order
+EXPENSE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "expense_id": {"type": "string"},
+        "project_id": {"type": "string"},
+        "department": {"type": "string"},
+        "amount": {"type": "number"},
+        "category": {"type": "string"},
+        "description": {"type": "string"},
+        "date": {"type": "string", "format": "date"},
+        "fiscal_year": {"type": "string"},
+        "recorded_by": {"type": "string"},
+        "recorded_on": {"type": "string", "format": "date-time"}
+    },
+    "required": ["expense_id", "project_id", "department", "amount", 
+                 "category", "description", "date", "fiscal_year"]
+}
+
+HEADER_FONT = Font(bold=True)
 
 def generate_expense_id():
     """Generate a unique expense ID with EXP prefix."""
@@ -30,25 +52,53 @@ def load_departments():
         raise FileNotFoundError(f"Budget allocation file not found: {budget_path}")
     
     try:
-        # Load budget allocations
-        wb = load_workbook(budget_path)
-        ws = wb["Allocations"]
-        
-        # Get column index for department
-        headers = [cell.value for cell in ws[1]]
-        dept_index = headers.index("department") + 1  # +1 because openpyxl is 1-indexed
-        
-        # Extract unique departments
-        departments = set()
-        for row in ws.iter_rows(min_row=2):  # Skip header row
-            dept = row[dept_index-1].value  # -1 to convert back to 0-indexed
-            if dept:
-                departments.add(dept)
+        # Load budget allocations read-only; only cell values are needed
+        wb = openpyxl.load_workbook(budget_path, read_only=True, data_only=True)
+        try:
+            rows = wb["Allocations"].iter_rows(values_only=True)
+            
+            # Get column index for department from the header row
+            headers = list(next(rows, ()))
+            dept_index = headers.index("department")
+            
+            # Extract unique departments from the remaining rows
+            departments = {row[dept_index] for row in rows if row[dept_index]}
+        finally:
+            wb.close()
         
         return list(departments)
     except Exception as e:
         raise Exception(f"Error loading departments: {str(e)}")
 
+def load_latest_allocations(budget_path):
+    """
+    Latest approved or allocated budget row for each department/category.
+    
+    Args:
+        budget_path (str): Path to the budget allocations workbook
+    
+    Returns:
+        pd.DataFrame: Allocation rows indexed by (department, category)
+    """
+    budget_df = read_excel_cached(budget_path, sheet_name="Allocations")
+    active = budget_df[budget_df["status"].isin(["approved", "allocated"])]
+    return (active.sort_values("allocation_date", ascending=False, kind="mergesort")
+                  .drop_duplicates(["department", "category"])
+                  .set_index(["department", "category"]))
+
+def load_project_spend(expense_path):
+    """
+    Total recorded expenses per project.
+    
+    Args:
+        expense_path (str): Path to the expenses workbook
+    
+    Returns:
+        dict: Mapping of project_id to total amount spent
+    """
+    expense_df = read_excel_cached(expense_path, sheet_name="Expenses")
+    return expense_df.groupby("project_id")["amount"].sum().to_dict()
+
 def validate_budget_available(department, amount, category):
     """
     Validate that sufficient budget is available for the expense.
@@ -64,32 +114,21 @@ def validate_budget_available(department, amount, category):
     budget_path = "data/budget_allocations.xlsx"
     expense_path = "data/expenses.xlsx"
     
-    # Load budget allocations
-    budget_df = pd.read_excel(budget_path, sheet_name="Allocations")
-    
-    # Filter by department and category
-    dept_budgets = budget_df[(budget_df["department"] == department) & 
-                            (budget_df["category"] == category) &
-                            (budget_df["status"].isin(["approved", "allocated"]))]
+    # Latest approved/allocated budget per department/category
+    latest_budgets = load_latest_allocations(budget_path)
     
-    if dept_budgets.empty:
+    if (department, category) not in latest_budgets.index:
         return False, None, None, 0
     
-    # Get latest fiscal year budget for this department/category
-    latest_budget = dept_budgets.sort_values("allocation_date", ascending=False).iloc[0]
+    latest_budget = latest_budgets.loc[(department, category)]
     project_id = latest_budget["project_id"]
     fiscal_year = latest_budget["fiscal_year"]
     allocated = float(latest_budget["allocated_amount"])
     
-    # Load existing expenses if available
+    # Look up spend for this project from per-project totals of existing expenses
     if os.path.exists(expense_path):
-        expense_df = pd.read_excel(expense_path, sheet_name="Expenses")
-        
-        # Filter expenses by project_id
-        project_expenses = expense_df[expense_df["project_id"] == project_id]
-        
-        # Sum up expenses
-        total_spent = project_expenses["amount"].sum() if not project_expenses.empty else 0
+        spent_by_project = load_project_spend(expense_path)
+        total_spent = spent_by_project.get(project_id, 0)
     else:
         total_spent = 0
     
@@ -129,37 +168,25 @@ def append_to_expense_sheet(expense_data):
     expense_path = "data/expenses.xlsx"
     sheet_name = "Expenses"
     
-    # Check if file exists
+    # New file: stream the header and first row with a write-only workbook
     if not os.path.exists(expense_path):
-        # Create schema on the fly for expenses
-        expense_schema = {
-            "type": "object",
-            "properties": {
-                "expense_id": {"type": "string"},
-                "project_id": {"type": "string"},
-                "department": {"type": "string"},
-                "amount": {"type": "number"},
-                "category": {"type": "string"},
-                "description": {"type": "string"},
-                "date": {"type": "string", "format": "date"},
-                "fiscal_year": {"type": "string"},
-                "recorded_by": {"type": "string"},
-                "recorded_on": {"type": "string", "format": "date-time"}
-            },
-            "required": ["expense_id", "project_id", "department", "amount", 
-                         "category", "description", "date", "fiscal_year"]
-        }
-        
-        # Write schema to temporary file
-        temp_schema_path = "temp_expense_schema.json"
-        with open(temp_schema_path, 'w') as f:
-            json.dump(expense_schema, f, indent=2)
+        os.makedirs(os.path.dirname(expense_path), exist_ok=True)
+        headers = list(EXPENSE_SCHEMA["properties"])
         
-        # Create Excel file with schema
-        create_sheets_from_schema(temp_schema_path, expense_path, sheet_name)
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet(sheet_name)
+        header_cells = []
+        for header in headers:
+            cell = WriteOnlyCell(ws, value=header)
+            cell.font = HEADER_FONT
+            header_cells.append(cell)
+        ws.append(header_cells)
+        ws.append([expense_data.get(header, "") for header in headers])
         
-        # Clean up temporary schema file
-        os.remove(temp_schema_path)
+        save_workbook(wb, expense_path)
+        print(f"Created {expense_path} with columns: {', '.join(headers)}")
+        print(f"Expense recorded in {expense_path}, sheet {sheet_name}")
+        return
     
     # Load workbook
     wb = load_workbook(expense_path)
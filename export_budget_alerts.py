@@ -2,12 +2,12 @@
 import os
 import csv
 import pandas as pd
-import openpyxl
 import time
 from datetime import datetime
 from pathlib import Path
 import logging
 import shutil
+from utils.read_engine import READ_ENGINE
 
 # Configure logging
 logging.basicConfig(
@@ -38,14 +38,14 @@ def export_alerts_to_csv(
         # Ensure the export directory exists
         os.makedirs(os.path.dirname(output_csv), exist_ok=True)
         
-        # Check if the Alerts sheet exists in the workbook
-        workbook = openpyxl.load_workbook(source_excel, read_only=True)
-        if 'Alerts' not in workbook.sheetnames:
-            logger.error(f"No Alerts sheet found in {source_excel}")
-            return False
+        # Open the workbook once: check for the Alerts sheet and read it from the same handle
+        with pd.ExcelFile(source_excel, engine=READ_ENGINE) as xl:
+            if 'Alerts' not in xl.sheet_names:
+                logger.error(f"No Alerts sheet found in {source_excel}")
+                return False
             
-        # Read the Alerts sheet
-        alerts_df = pd.read_excel(source_excel, sheet_name='Alerts')
+            # Read the Alerts sheet
+            alerts_df = xl.parse('Alerts')
         
         # Extract only the required columns
         if all(col in alerts_df.columns for col in ['department', 'project_id', 'allocated_amount', 'remaining_budget', 'overrun_amount', 'status']):
@@ -9,6 +9,7 @@ import json
 from datetime import datetime
 import os
 from pathlib import Path
+from utils.excel_handler import read_excel
 
 def load_schema():
     """Load budget allocation schema for validation"""
@@ -28,86 +29,64 @@ def calculate_year_end_forecast(data_path='data/budget_allocations.xlsx'):
     """
     try:
         # Load allocations data
-        allocations_df = pd.read_excel(data_path, sheet_name='Allocations')
+        allocations_df = read_excel(data_path, sheet_name='Allocations')
         
         # Load actuals data (monthly spending)
-        actuals_df = pd.read_excel(data_path, sheet_name='Actuals')
+        actuals_df = read_excel(data_path, sheet_name='Actuals')
         
         # Current month (1-12)
         current_month = datetime.now().month
         current_year = datetime.now().year
         
-        # Create result dataframes
-        forecast_results = []
-        
-        # Group actuals by department and project_id
-        grouped = actuals_df.groupby(['department', 'project_id'])
-        
-        for (dept, proj_id), group in grouped:
-            # Get allocated budget for this department/project
-            allocated = allocations_df[
-                (allocations_df['department'] == dept) & 
-                (allocations_df['project_id'] == proj_id)
-            ]['allocated_amount'].iloc[0] if not allocations_df[
-                (allocations_df['department'] == dept) & 
-                (allocations_df['project_id'] == proj_id)
-            ].empty else 0
-            
-            # Get monthly spending data
-            monthly_spend = group.pivot_table(
-                index=['department', 'project_id'], 
-                columns='month', 
-                values='amount', 
-                aggfunc='sum'
-            ).fillna(0).iloc[0]
-            
-            # Calculate spending to date
-            spend_to_date = sum(monthly_spend.get(i, 0) for i in range(1, current_month + 1))
-            
-            # Calculate monthly average spending
-            months_with_data = sum(1 for i in range(1, current_month + 1) if monthly_spend.get(i, 0) > 0)
-            avg_monthly_spend = spend_to_date / max(months_with_data, 1)
-            
-            # Project remaining months
-            remaining_months = 12 - current_month
-            projected_additional_spend = avg_monthly_spend * remaining_months
-            
-            # Calculate projected year-end total
-            projected_total = spend_to_date + projected_additional_spend
-            
-            # Calculate percent of allocation
-            percent_used = (spend_to_date / allocated * 100) if allocated > 0 else 0
-            projected_percent = (projected_total / allocated * 100) if allocated > 0 else 0
-            
-            # Determine status based on projected spend vs allocation
-            if projected_percent > 110:
-                status = "Over Budget"
-            elif projected_percent > 98:
-                status = "At Risk"
-            elif projected_percent < 75:
-                status = "Underspend"
-            else:
-                status = "On Track"
-                
-            # Get monthly spending for sparkline
-            monthly_values = [monthly_spend.get(i, 0) for i in range(1, 13)]
-                
-            # Store result
-            forecast_results.append({
-                'department': dept,
-                'project_id': proj_id,
-                'allocated_amount': allocated,
-                'spend_to_date': spend_to_date,
-                'percent_used': percent_used,
-                'average_monthly_spend': avg_monthly_spend,
-                'projected_year_end': projected_total,
-                'projected_percent': projected_percent,
-                'status': status,
-                'monthly_values': monthly_values  # For sparkline chart
-            })
-        
-        # Create DataFrame from results
-        forecast_df = pd.DataFrame(forecast_results)
+        # Monthly spend per department/project in one pivot, one column per month
+        monthly_spend = actuals_df.pivot_table(
+            index=['department', 'project_id'], 
+            columns='month', 
+            values='amount', 
+            aggfunc='sum',
+            fill_value=0
+        ).reindex(columns=range(1, 13), fill_value=0)
+        to_date = monthly_spend[list(range(1, current_month + 1))]
+        
+        # Calculate spending to date and the monthly average over months with spend
+        spend_to_date = to_date.sum(axis=1).to_numpy(dtype=float)
+        months_with_data = (to_date > 0).sum(axis=1).clip(lower=1).to_numpy()
+        avg_monthly_spend = spend_to_date / months_with_data
+        
+        # Project remaining months to a year-end total
+        remaining_months = 12 - current_month
+        projected_total = spend_to_date + avg_monthly_spend * remaining_months
+        
+        # Allocated budget: first allocation row for each department/project, 0 if none
+        allocations = allocations_df.drop_duplicates(['department', 'project_id']).set_index(['department', 'project_id'])
+        allocated = allocations['allocated_amount'].reindex(monthly_spend.index).fillna(0).to_numpy(dtype=float)
+        
+        # Calculate percent of allocation
+        has_allocation = allocated > 0
+        safe_allocated = np.where(has_allocation, allocated, 1)
+        percent_used = np.where(has_allocation, spend_to_date / safe_allocated * 100, 0)
+        projected_percent = np.where(has_allocation, projected_total / safe_allocated * 100, 0)
+        
+        # Determine status based on projected spend vs allocation
+        status = np.select(
+            [projected_percent > 110, projected_percent > 98, projected_percent < 75],
+            ["Over Budget", "At Risk", "Underspend"],
+            default="On Track"
+        )
+        
+        # Create DataFrame from results; monthly values feed the sparkline chart
+        forecast_df = pd.DataFrame({
+            'department': monthly_spend.index.get_level_values('department'),
+            'project_id': monthly_spend.index.get_level_values('project_id'),
+            'allocated_amount': allocated,
+            'spend_to_date': spend_to_date,
+            'percent_used': percent_used,
+            'average_monthly_spend': avg_monthly_spend,
+            'projected_year_end': projected_total,
+            'projected_percent': projected_percent,
+            'status': status,
+            'monthly_values': monthly_spend.to_numpy().tolist()
+        })
         
         # Save to Excel with formatting and sparklines
         create_forecast_sheet(data_path, forecast_df)
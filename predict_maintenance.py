@@ -40,8 +40,8 @@ def predict_maintenance():
         grouped = df.sort_values('date').groupby('asset_id')
         
         for asset_id, group in grouped:
-            # Calculate intervals between consecutive maintenance dates
-            dates = group['date'].sort_values().reset_index(drop=True)
+            # Dates are already ascending from the sort above
+            dates = group['date']
             
             # Get the last action taken for this asset
             last_action = group.loc[group['date'].idxmax(), 'action_taken'] if not group.empty else "Unknown"
@@ -49,10 +49,7 @@ def predict_maintenance():
             
             if len(dates) >= 2:
                 # Calculate differences between consecutive dates in days
-                intervals = []
-                for i in range(1, len(dates)):
-                    interval = (dates[i] - dates[i-1]).days
-                    intervals.append(interval)
+                intervals = dates.diff().dropna().dt.days.values
                 
                 # Store average interval and last maintenance date
                 intervals_by_asset[asset_id] = np.mean(intervals)
@@ -1,18 +1,21 @@
 # register_asset.py
 
 import os
+import csv
 import json
 import uuid
 import datetime
 from pathlib import Path
 
 # Import our custom Excel utilities
-from utils.excel_handler import load_workbook, save_workbook, create_sheets_from_schema
+from utils.excel_handler import load_workbook, save_workbook, create_sheets_from_schema, migrate_log_to_csv
 
 # Constants
 SCHEMA_PATH = 'asset_schema.json'
 ASSETS_PATH = 'data/assets.xlsx'
-LOG_PATH = 'data/asset_log.xlsx'
+LOG_PATH = 'data/asset_log.csv'
+# Earlier versions kept the log in a workbook; it seeds the CSV on first use
+LEGACY_LOG_PATH = 'data/asset_log.xlsx'
 LOG_HEADERS = ['Timestamp', 'Asset ID', 'Asset Type', 'Action', 'Details']
 
 def ensure_data_directory():
@@ -43,17 +46,11 @@ def register_asset():
     # Prepare workbooks
     create_sheets_from_schema(SCHEMA_PATH, ASSETS_PATH)
     
-    # Initialize asset log file if it doesn't exist
+    # Initialize asset log file if it doesn't exist, carrying over the old workbook log
+    migrate_log_to_csv(LEGACY_LOG_PATH, LOG_PATH)
     if not os.path.exists(LOG_PATH):
-        log_wb = load_workbook(LOG_PATH) if os.path.exists(LOG_PATH) else None
-        if log_wb is None:
-            from openpyxl import Workbook
-            log_wb = Workbook()
-            log_ws = log_wb.active
-            log_ws.title = "Asset Log"
-            for col_idx, header in enumerate(LOG_HEADERS, start=1):
-                log_ws.cell(row=1, column=col_idx, value=header)
-            log_wb.save(LOG_PATH)
+        with open(LOG_PATH, 'w', newline='') as f:
+            csv.writer(f).writerow(LOG_HEADERS)
     
     # Display available asset types
     asset_types = list(schema.keys())
@@ -101,18 +98,12 @@ def register_asset():
     save_workbook(assets_wb, ASSETS_PATH)
     
     # Log the registration
-    log_wb = load_workbook(LOG_PATH)
-    log_ws = log_wb.active
-    
     timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     log_entry = [timestamp, asset_id, asset_type, 'REGISTER', 'New asset registered']
     
-    next_row = log_ws.max_row + 1
-    for col_idx, value in enumerate(log_entry, start=1):
-        log_ws.cell(row=next_row, column=col_idx, value=value)
-    
-    # Save the updated log workbook
-    save_workbook(log_wb, LOG_PATH)
+    # Append to the CSV log; no need to reload earlier entries
+    with open(LOG_PATH, 'a', newline='') as f:
+        csv.writer(f).writerow(log_entry)
     
     print(f"\nSuccess! {asset_type} with ID {asset_id} has been registered.")
     print(f"A log entry has been added to {LOG_PATH}")
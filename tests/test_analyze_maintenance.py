@@ -110,6 +110,55 @@ def test_analyze_with_records_no_export(tmp_cwd, capsys):
     assert row_b["repairs"] == 0
     assert row_b["replacements"] == 1
 
+# --- Test: many assets (int8 category codes must not overflow) ---
+
+def test_analyze_many_assets(tmp_cwd):
+    history_path = tmp_cwd / "data" / "maintenance_history.xlsx"
+    actions = ["Inspection", "Repair", "Replacement"]
+    data = []
+    for i in range(60):
+        data.append({"asset_id": f"A{i:03d}", "date": "2025-01-01", "cost": 10.0, "action_taken": actions[i % 3]})
+        data.append({"asset_id": f"A{i:03d}", "date": "2025-01-21", "cost": 5.0, "action_taken": "Repair"})
+    with pd.ExcelWriter(history_path, engine="openpyxl") as w:
+        pd.DataFrame(data).to_excel(w, sheet_name="Maintenance History", index=False)
+
+    results = analyze_maintenance.analyze_maintenance(history_path=str(history_path), export=False)
+
+    assert len(results) == 60
+    assert (results["record_count"] == 2).all()
+    assert (results["total_cost"] == 15).all()
+    assert (results["inspections"] + results["repairs"] + results["replacements"] == 2).all()
+    last = results.set_index("asset_id").loc["A059"]
+    assert last["replacements"] == 1 and last["repairs"] == 1
+
+# --- Test: records without a date ---
+
+def test_analyze_missing_date(tmp_cwd):
+    history_path = tmp_cwd / "data" / "maintenance_history.xlsx"
+    df = pd.DataFrame([
+        {"asset_id": "A", "date": "2024-01-01", "cost": 10.0, "action_taken": "Inspection"},
+        {"asset_id": "A", "date": "2024-03-01", "cost": 20.0, "action_taken": "Repair"},
+        {"asset_id": "A", "date": None, "cost": 30.0, "action_taken": "Repair"},
+        {"asset_id": "B", "date": None, "cost": 5.0, "action_taken": "Inspection"},
+    ])
+    with pd.ExcelWriter(history_path, engine="openpyxl") as w:
+        df.to_excel(w, sheet_name="Maintenance History", index=False)
+
+    results = analyze_maintenance.analyze_maintenance(history_path=str(history_path), export=False)
+    row_a = results.set_index("asset_id").loc["A"]
+    assert row_a["record_count"] == 3
+    assert row_a["first_maintenance"] == pd.Timestamp("2024-01-01")
+    assert row_a["last_maintenance"] == pd.Timestamp("2024-03-01")
+    assert row_a["time_span_days"] == 60
+    assert row_a["avg_interval_days"] == 60
+    assert row_a["total_cost"] == 60
+    assert row_a["repairs"] == 2
+
+    row_b = results.set_index("asset_id").loc["B"]
+    assert row_b["record_count"] == 1
+    assert pd.isna(row_b["last_maintenance"])
+    assert np.isnan(row_b["time_span_days"])
+
 # --- Test: export adds sheet ---
 
 def test_analyze_export_appends_sheet(tmp_cwd):
@@ -138,3 +187,65 @@ def test_analyze_export_appends_sheet(tmp_cwd):
         "avg_cost_per_maintenance","inspections","repairs","replacements"
     ]
     assert list(analysis_df.columns) == expected_cols
+
+# --- Test: interval reduction kernel ---
+
+def test_reduce_intervals_per_asset():
+    # asset 0: three records 5 and 15 days apart; asset 1: a single record
+    codes = np.array([0, 0, 0, 1])
+    dates = pd.to_datetime(["2025-01-01", "2025-01-06", "2025-01-21", "2025-02-01"]).values.view("int64")
+
+    stats = analyze_maintenance.reduce_intervals(codes, dates)
+
+    assert list(stats["record_count"]) == [3, 1]
+    assert list(stats["first_date"]) == [dates[0], dates[3]]
+    assert list(stats["last_date"]) == [dates[2], dates[3]]
+    assert stats["avg_interval"][0] == 10
+    assert stats["min_interval"][0] == 5
+    assert stats["max_interval"][0] == 15
+    assert np.isnan(stats["avg_interval"][1])
+    assert np.isnan(stats["min_interval"][1])
+    assert np.isnan(stats["max_interval"][1])
+
+# --- Test: re-export replaces the previous analysis sheet ---
+
+def test_analyze_export_replaces_existing_sheet(tmp_cwd):
+    history_path = tmp_cwd / "data" / "maintenance_history.xlsx"
+    df = pd.DataFrame([
+        {"asset_id": "X", "date": "2025-05-01", "cost": 10.0, "action_taken": "Inspection"}
+    ])
+    with pd.ExcelWriter(history_path, engine="openpyxl") as w:
+        df.to_excel(w, sheet_name="Maintenance History", index=False)
+        pd.DataFrame({"stale": [1]}).to_excel(w, sheet_name="Maintenance Analysis", index=False)
+
+    analyze_maintenance.analyze_maintenance(history_path=str(history_path), export=True)
+
+    xl = pd.ExcelFile(history_path)
+    assert xl.sheet_names.count("Maintenance Analysis") == 1
+    assert "stale" not in xl.parse("Maintenance Analysis").columns
+
+# --- Test: unchanged analysis is not re-exported ---
+
+def test_analyze_export_skipped_when_unchanged(tmp_cwd, capsys):
+    history_path = tmp_cwd / "data" / "maintenance_history.xlsx"
+    df = pd.DataFrame([
+        {"asset_id": "X", "date": "2025-05-01", "cost": 10.0, "action_taken": "Inspection"},
+        {"asset_id": "X", "date": "2025-06-01", "cost": 20.0, "action_taken": "Repair"},
+    ])
+    with pd.ExcelWriter(history_path, engine="openpyxl") as w:
+        df.to_excel(w, sheet_name="Maintenance History", index=False)
+
+    analyze_maintenance.analyze_maintenance(history_path=str(history_path), export=True)
+    assert "Analysis exported" in capsys.readouterr().out
+    assert (tmp_cwd / "data" / ".maintenance_history_analysis.hash").exists()
+
+    # Same history: the export is skipped
+    analyze_maintenance.analyze_maintenance(history_path=str(history_path), export=True)
+    assert "skipping export" in capsys.readouterr().out
+
+    # Analysis sheet removed by hand: the export runs again
+    with pd.ExcelWriter(history_path, engine="openpyxl") as w:
+        df.to_excel(w, sheet_name="Maintenance History", index=False)
+    analyze_maintenance.analyze_maintenance(history_path=str(history_path), export=True)
+    assert "Analysis exported" in capsys.readouterr().out
+    assert "Maintenance Analysis" in pd.ExcelFile(history_path).sheet_names
@@ -24,15 +24,17 @@ def setup_paths(tmp_path, monkeypatch):
         json.dump(SCHEMA_CONTENT, f)
 
     assets_path = data_dir / "assets.xlsx"
-    log_path = data_dir / "asset_log.xlsx"
+    log_path = data_dir / "asset_log.csv"
 
     monkeypatch.setattr("register_asset.SCHEMA_PATH", str(schema_path))
     monkeypatch.setattr("register_asset.ASSETS_PATH", str(assets_path))
     monkeypatch.setattr("register_asset.LOG_PATH", str(log_path))
+    monkeypatch.setattr("register_asset.LEGACY_LOG_PATH", str(data_dir / "asset_log.xlsx"))
     monkeypatch.setattr("query_assets.ASSETS_PATH", str(assets_path))
     monkeypatch.setattr("query_assets.SCHEMA_PATH", str(schema_path))
     monkeypatch.setattr("delete_asset.ASSETS_PATH", str(assets_path))
     monkeypatch.setattr("delete_asset.LOG_PATH", str(log_path))
+    monkeypatch.setattr("delete_asset.LEGACY_LOG_PATH", str(data_dir / "asset_log.xlsx"))
 
     return {
         "schema_path": schema_path,
@@ -60,7 +62,7 @@ def test_register_asset(setup_paths, monkeypatch, capsys):
     asset_id = create_test_asset(setup_paths, monkeypatch, capsys)
     df = pd.read_excel(setup_paths["assets_path"], sheet_name="Road")
     assert df.iloc[0]["ID"] == asset_id
-    log = pd.read_excel(setup_paths["log_path"])
+    log = pd.read_csv(setup_paths["log_path"])
     assert log.iloc[0]["Asset ID"] == asset_id
     assert log.iloc[0]["Action"] == "REGISTER"
 
@@ -104,6 +106,38 @@ def test_find_asset(setup_paths, monkeypatch, capsys):
     sheet, idx, data = find_asset("fake-id")
     assert sheet is None and idx is None and data is None
 
+def build_assets_workbook(path):
+    from openpyxl import Workbook
+    wb = Workbook()
+    wb.active.title = "Notes"
+    wb.active.append(["No ID column here"])
+    ws = wb.create_sheet("Road")
+    ws.append(["ID", "Name", "Location"])
+    ws.append(["A1", "Main Street", "Downtown"])
+    ws.append([])
+    ws.append(["A2", "Side Street", None])
+    wb.save(path)
+
+def test_find_asset_searches_sheets_with_id_column(setup_paths):
+    build_assets_workbook(setup_paths["assets_path"])
+
+    sheet, idx, data = find_asset("A2")
+    assert (sheet, idx) == ("Road", 4)
+    assert data == {"ID": "A2", "Name": "Side Street", "Location": None}
+
+def test_delete_asset_removes_located_row(setup_paths, capsys):
+    build_assets_workbook(setup_paths["assets_path"])
+
+    assert delete_asset("A2", confirm=False) is True
+    assert "Success!" in capsys.readouterr().out
+    assert find_asset("A2") == (None, None, None)
+    assert find_asset("A1")[:2] == ("Road", 2)
+
+    log = pd.read_csv(setup_paths["log_path"])
+    assert list(log.columns) == ["Timestamp", "Asset ID", "Asset Type", "Action", "Details"]
+    assert log.iloc[-1]["Asset ID"] == "A2"
+    assert log.iloc[-1]["Action"] == "DELETE"
+
 def test_delete_asset(setup_paths, monkeypatch, capsys):
     asset_id = create_test_asset(setup_paths, monkeypatch, capsys)
     monkeypatch.setattr("builtins.input", lambda _: "y")
@@ -114,7 +148,7 @@ def test_delete_asset(setup_paths, monkeypatch, capsys):
 
     df = pd.read_excel(setup_paths["assets_path"], sheet_name="Road")
     assert len(df) == 0
-    log = pd.read_excel(setup_paths["log_path"])
+    log = pd.read_csv(setup_paths["log_path"])
     assert len(log) == 2
     assert log.iloc[1]["Action"] == "DELETE"
 
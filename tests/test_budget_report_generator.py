@@ -9,17 +9,20 @@ import pandas as pd
 import pytest
 
 import budget_report_generator as brg
+from utils import excel_handler
 
 # --- FIXTURE: SANDBOX CWD & DATA DIR ---
 
 @pytest.fixture(autouse=True)
 def tmp_env(tmp_path, monkeypatch):
     """
-    Run each test in its own temp directory, with data/ and reports/ subfolders.
+    Run each test in its own temp directory, with data/ and reports/ subfolders
+    and its own read cache.
     """
     monkeypatch.chdir(tmp_path)
     (tmp_path / "data").mkdir()
     (tmp_path / "reports").mkdir()
+    monkeypatch.setattr(excel_handler, "CACHE_DIR", str(tmp_path / "cache"))
     yield
 
 # --- format_currency tests ---
@@ -92,14 +95,15 @@ def test_generate_report_basic():
     # Check D1 row values
     for row in ws.iter_rows(min_row=3, max_col=6, values_only=True):
         if row[0] == "D1":
-            assert row[1] == "$100.00"
-            assert row[2] == "$30.00"
-            assert row[3] == "$70.00"
+            assert row[1] == 100
+            assert row[2] == 30
+            assert row[3] == 70
             assert row[4] == "30.0%"
             assert row[5] == "ACTIVE"
             break
     else:
         pytest.fail("D1 not found in summary")
+    assert all(ws.cell(row=3, column=col).number_format == brg.CURRENCY_FORMAT for col in (2, 3, 4))
 
     # Alerts sheet should contain "No budget alerts"
     ws_alerts = wb["Alerts"]
@@ -123,3 +127,113 @@ def test_generate_report_auto_fiscal_year():
     wb = openpyxl.load_workbook(out)
     title = wb["Summary"]["A1"].value
     assert "Fiscal Year 2025-2026" in title
+
+def test_generate_report_alerts_rows():
+    budgets = [
+        {"department":"D1","project_id":"P1","category":"CatA",
+         "allocation_date":"2025-01-01","allocated_amount":100,"fiscal_year":"2025-2026"},
+        {"department":"D1","project_id":"P2","category":"CatB",
+         "allocation_date":"2025-02-01","allocated_amount":200,"fiscal_year":"2025-2026"}
+    ]
+    expenses = [
+        {"expense_id":"E1","department":"D1","project_id":"P1","date":"2025-03-01","category":"CatA",
+         "amount": 150,"description":"desc","recorded_by":"U","fiscal_year":"2025-2026"},
+        {"expense_id":"E2","department":"D1","project_id":"P2","date":"2025-03-02","category":"CatB",
+         "amount": 190,"description":"desc","recorded_by":"U","fiscal_year":"2025-2026"}
+    ]
+    write_budget_and_expenses(budgets, expenses)
+
+    out = "reports/alerts.xlsx"
+    brg.generate_budget_report(output_path=out, fiscal_year="2025-2026")
+
+    wb = openpyxl.load_workbook(out)
+    ws = wb["Alerts"]
+    # Header row sits on row 3, directly above the alerts
+    assert [c.value for c in ws[3][:5]] == ["Department","Project ID","Category","Issue","Details"]
+    assert [c.value for c in ws[4][:4]] == ["D1","P1","CatA","BUDGET OVERRUN"]
+    assert ws["A4"].fill.fgColor.rgb == "00FFD9D9"
+    assert [c.value for c in ws[5][:4]] == ["D1","P2","CatB","LOW BUDGET"]
+    assert ws["A5"].fill.fgColor.rgb == "00FFEB9C"
+
+    # Summary header links to the Alerts sheet when alerts exist
+    assert wb["Summary"]["F2"].hyperlink.target == "#Alerts!A1"
+
+def test_generate_report_details_sorted_by_department():
+    budgets = [
+        {"department":"Roads","project_id":"P1","category":"CatA",
+         "allocation_date":"2025-01-01","allocated_amount":100,"fiscal_year":"2025-2026"},
+        {"department":"Parks","project_id":"P2","category":"CatB",
+         "allocation_date":"2025-02-01","allocated_amount":200,"fiscal_year":"2025-2026"},
+        {"department":"Roads","project_id":"P3","category":"CatA",
+         "allocation_date":"2025-03-01","allocated_amount":300,"fiscal_year":"2025-2026"}
+    ]
+    write_budget_and_expenses(budgets, [])
+
+    out = "reports/sorted.xlsx"
+    brg.generate_budget_report(output_path=out, fiscal_year="2025-2026")
+
+    ws = openpyxl.load_workbook(out)["Department Details"]
+    column_a = [c.value for c in ws["A"] if c.value is not None]
+    headers = [v for v in column_a if str(v).startswith("Department: ")]
+    assert headers == ["Department: Parks", "Department: Roads"]
+    # Allocation order is kept within a department
+    assert column_a.index("P1") < column_a.index("P3")
+
+def test_generate_report_blank_and_numeric_project_ids():
+    budgets = [
+        {"department":"D1","project_id":None,"category":"CatA",
+         "allocation_date":"2025-01-01","allocated_amount":100,"fiscal_year":"2025-2026"},
+        {"department":"D1","project_id":101,"category":"CatB",
+         "allocation_date":"2025-02-01","allocated_amount":200,"fiscal_year":"2025-2026"}
+    ]
+    expenses = [
+        {"expense_id":"E1","department":"D1","project_id":None,"date":"2025-03-01","category":"CatA",
+         "amount": 10,"description":"desc","recorded_by":"U","fiscal_year":"2025-2026"},
+        {"expense_id":"E2","department":"D1","project_id":101,"date":"2025-03-02","category":"CatB",
+         "amount": 50,"description":"desc","recorded_by":"U","fiscal_year":"2025-2026"}
+    ]
+    write_budget_and_expenses(budgets, expenses)
+
+    out = "reports/blank_ids.xlsx"
+    brg.generate_budget_report(output_path=out, fiscal_year="2025-2026")
+
+    ws = openpyxl.load_workbook(out)["Department Details"]
+    column_a = [c.value for c in ws["A"] if c.value is not None]
+    # Numeric project IDs are written as numbers, not text
+    assert 101 in column_a
+    assert "101" not in column_a
+
+def test_generate_report_chart_ranges_cover_all_departments():
+    budgets = [
+        {"department":d,"project_id":f"P{i}","category":"CatA",
+         "allocation_date":"2025-01-01","allocated_amount":100,"fiscal_year":"2025-2026"}
+        for i, d in enumerate(["D1", "D2", "D3"])
+    ]
+    write_budget_and_expenses(budgets, [])
+
+    out = "reports/charts.xlsx"
+    brg.generate_budget_report(output_path=out, fiscal_year="2025-2026")
+
+    pie, bar = openpyxl.load_workbook(out)["Summary"]._charts
+    # Three departments on rows 3-5; the TOTAL row (6) is left out
+    assert pie.series[0].val.numRef.f == "'Summary'!$B$3:$B$5"
+    assert pie.series[0].cat.numRef.f == "'Summary'!$A$3:$A$5"
+    assert [s.val.numRef.f for s in bar.series] == ["'Summary'!$C$3:$C$5", "'Summary'!$D$3:$D$5"]
+
+def test_generate_report_async_saves_in_background():
+    budgets = [
+        {"department":"D1","project_id":"P1","category":"CatA",
+         "allocation_date":"2025-01-01","allocated_amount":100,"fiscal_year":"2025-2026"}
+    ]
+    write_budget_and_expenses(budgets, [])
+
+    future = brg.generate_budget_report_async(output_path="reports/async.xlsx",
+                                              fiscal_year="2025-2026")
+    assert future.result(timeout=30) == "reports/async.xlsx"
+    assert openpyxl.load_workbook("reports/async.xlsx")["Summary"]["A3"].value == "D1"
+
+def test_generate_report_async_raises_before_saving():
+    write_budget_and_expenses([], [])
+    with pytest.raises(ValueError):
+        brg.generate_budget_report_async(output_path="reports/none.xlsx", fiscal_year="2025-2026")
+    assert not Path("reports/none.xlsx").exists()
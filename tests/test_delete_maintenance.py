@@ -1,5 +1,6 @@
 import os
 import re
+import sys
 import json
 import shutil
 import pandas as pd
@@ -71,32 +72,37 @@ def test_verify_sheet_creates_missing(tmp_cwd, monkeypatch):
 
     monkeypatch.setattr(delete_maintenance, 'backup_workbook', fake_backup)
 
-    # Fake import of excel_handler with the function
-    class FakeEH:
-        @staticmethod
-        def create_maintenance_history_sheet(p):
-            calls['recreated'] = True
-            # actually add the sheet so verify returns True
-            wb2 = load_workbook(p)
-            ws = wb2.create_sheet("Maintenance History")
-            ws['A1'] = "record_id"
-            wb2.save(p)
-            wb2.close()
-            return True
-
-    # but verify imports from utils/excel_handler.py, so patch importlib
-    import importlib.util
-    real_spec = importlib.util.spec_from_file_location
-    def fake_spec(name, location):
-        # Return a spec whose loader will exec FakeEH
-        class Spec:
-            loader = type('L', (), {'exec_module': lambda self, mod: mod.__dict__.update(FakeEH.__dict__)})
-        return Spec()
-    monkeypatch.setattr(importlib.util, 'spec_from_file_location', fake_spec)
+    def fake_create(p):
+        calls['recreated'] = True
+        # actually add the sheet so verify returns True
+        wb2 = load_workbook(p)
+        ws = wb2.create_sheet("Maintenance History")
+        ws['A1'] = "record_id"
+        wb2.save(p)
+        wb2.close()
+        return True
+
+    import utils.excel_handler
+    monkeypatch.setattr(utils.excel_handler, 'create_maintenance_history_sheet', fake_create)
 
     result = delete_maintenance.verify_maintenance_sheet(str(path))
+    assert result is True
     assert calls['backed_up']
-    assert calls['recreated'] == False
+    assert calls['recreated']
+    assert "Maintenance History" in load_workbook(path).sheetnames
+
+def test_verify_sheet_missing_without_repair_function(tmp_cwd, monkeypatch):
+    # Create an Excel file lacking the sheet
+    path = tmp_cwd / "data" / "maintenance_history.xlsx"
+    wb = Workbook()
+    wb.save(path)
+    wb.close()
+
+    monkeypatch.setattr(delete_maintenance, 'backup_workbook', lambda p: str(p)+"_bak.xlsx")
+    # A None entry in sys.modules makes the import raise ImportError
+    monkeypatch.setitem(sys.modules, 'utils.excel_handler', None)
+
+    assert delete_maintenance.verify_maintenance_sheet(str(path)) is False
 
 def test_verify_sheet_invalid_structure(tmp_cwd):
     # Create a workbook with Maintenance History but missing record_id
@@ -187,3 +193,63 @@ def test_delete_force_success(tmp_cwd, monkeypatch):
     # file now contains only BBB
     df2 = pd.read_excel(path, sheet_name="Maintenance History")
     assert list(df2['record_id']) == ["BBB"]
+
+def test_delete_keeps_other_rows_and_sheets(tmp_cwd, monkeypatch):
+    # Create file with three records plus an unrelated sheet
+    path = tmp_cwd / "data" / "maintenance_history.xlsx"
+    df = pd.DataFrame([
+        {"record_id": "AAA", "asset_id": "X"},
+        {"record_id": "BBB", "asset_id": "Y"},
+        {"record_id": "CCC", "asset_id": "Z"}
+    ])
+    with pd.ExcelWriter(path, engine='openpyxl') as w:
+        df.to_excel(w, sheet_name="Maintenance History", index=False)
+        pd.DataFrame([{"note": "keep"}]).to_excel(w, sheet_name="Notes", index=False)
+
+    monkeypatch.setattr(delete_maintenance, 'backup_workbook', lambda p: str(p)+"_bak.xlsx")
+
+    assert delete_maintenance.delete_maintenance_record("BBB", force=True) is True
+
+    df2 = pd.read_excel(path, sheet_name="Maintenance History")
+    assert list(df2['record_id']) == ["AAA", "CCC"]
+    assert list(df2['asset_id']) == ["X", "Z"]
+    notes = pd.read_excel(path, sheet_name="Notes")
+    assert list(notes['note']) == ["keep"]
+
+def test_delete_without_backup(tmp_cwd, monkeypatch):
+    # Create file with two records
+    path = tmp_cwd / "data" / "maintenance_history.xlsx"
+    df = pd.DataFrame([{"record_id": "AAA"}, {"record_id": "BBB"}])
+    with pd.ExcelWriter(path, engine='openpyxl') as w:
+        df.to_excel(w, sheet_name="Maintenance History", index=False)
+
+    backups = []
+    monkeypatch.setattr(delete_maintenance, 'backup_workbook', lambda p: backups.append(p) or str(p)+"_bak.xlsx")
+
+    assert delete_maintenance.delete_maintenance_record("AAA", force=True, backup=False) is True
+    assert backups == []
+    df2 = pd.read_excel(path, sheet_name="Maintenance History")
+    assert list(df2['record_id']) == ["BBB"]
+
+def test_locate_record_matches_numeric_ids():
+    wb = Workbook()
+    ws = wb.active
+    ws.append(["record_id", "asset_id"])
+    ws.append(["AAA", "X"])
+    ws.append([1002, "Y"])
+
+    assert delete_maintenance.locate_record(ws, "AAA") == (2, {"record_id": "AAA", "asset_id": "X"})
+    assert delete_maintenance.locate_record(ws, "1002") == (3, {"record_id": 1002, "asset_id": "Y"})
+    assert delete_maintenance.locate_record(ws, "ZZZ") == (None, None)
+
+def test_log_records_reach_file_with_root_configured():
+    import logging
+    # excel_handler configures the root logger on import; records must still be written
+    import utils.excel_handler  # noqa: F401
+    assert logging.getLogger().handlers
+
+    delete_maintenance.logger.info("log check for delete_maintenance")
+    delete_maintenance.log_listener.stop()
+    delete_maintenance.log_listener.start()
+    with open(delete_maintenance.log_file_handler.baseFilename) as f:
+        assert "log check for delete_maintenance" in f.read()
@@ -13,8 +13,11 @@ from utils.excel_handler import (
     save_workbook,
     init_workbook,
     create_sheets_from_schema,
-    create_tasks_sheet
+    create_tasks_sheet,
+    read_excel_cached,
+    migrate_log_to_csv
 )
+from utils import excel_handler
 
 @pytest.fixture
 def sample_headers():
@@ -112,6 +115,85 @@ def test_save_workbook_roundtrip(tmp_path):
     assert wb3.active.cell(row=1, column=1).value == "UPDATED"
     wb3.close()
 
+def test_read_excel_cached_reuses_until_workbook_changes(tmp_path):
+    path = tmp_path / "data.xlsx"
+    cache_dir = tmp_path / "cache"
+    pd.DataFrame({"a": [1, 2]}).to_excel(path, index=False)
+
+    first = read_excel_cached(str(path), cache_dir=str(cache_dir))
+    assert first["a"].tolist() == [1, 2]
+    cached = list(cache_dir.iterdir())
+    assert len(cached) == 1
+
+    # An unchanged workbook is served from the cache
+    entry = pd.read_pickle(cached[0])
+    entry["data"] = pd.DataFrame({"a": [9]})
+    pd.to_pickle(entry, cached[0])
+    assert read_excel_cached(str(path), cache_dir=str(cache_dir))["a"].tolist() == [9]
+
+    # A changed workbook is read again
+    pd.DataFrame({"a": [3]}).to_excel(path, index=False)
+    assert read_excel_cached(str(path), cache_dir=str(cache_dir))["a"].tolist() == [3]
+
+def test_read_excel_cached_rereads_workbook_with_older_mtime(tmp_path):
+    path = tmp_path / "data.xlsx"
+    cache_dir = tmp_path / "cache"
+    pd.DataFrame({"a": [1]}).to_excel(path, index=False)
+    assert read_excel_cached(str(path), cache_dir=str(cache_dir))["a"].tolist() == [1]
+
+    # A workbook restored from a backup keeps an mtime older than the cache entry
+    old_mtime = os.path.getmtime(path) - 3600
+    pd.DataFrame({"a": [5]}).to_excel(path, index=False)
+    os.utime(path, (old_mtime, old_mtime))
+    assert read_excel_cached(str(path), cache_dir=str(cache_dir))["a"].tolist() == [5]
+
+def test_read_excel_cached_defaults_to_user_cache(tmp_path, monkeypatch):
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    path = data_dir / "data.xlsx"
+    pd.DataFrame({"a": [1]}).to_excel(path, index=False)
+    user_cache = tmp_path / "user_cache"
+    monkeypatch.setattr(excel_handler, "CACHE_DIR", str(user_cache))
+
+    # Cached frames are unpickled, so none are written to the shared data folder
+    monkeypatch.chdir(tmp_path)
+    read_excel_cached(str(path))
+    assert len(list(user_cache.iterdir())) == 1
+    assert not (data_dir / ".cache").exists()
+
+def test_read_excel_cached_rejects_callable_options(tmp_path):
+    path = tmp_path / "data.xlsx"
+    pd.DataFrame({"a": [1], "b": [2]}).to_excel(path, index=False)
+
+    # A callable filter cannot be keyed, so a changed filter could serve stale data
+    with pytest.raises(TypeError):
+        read_excel_cached(str(path), cache_dir=str(tmp_path / "cache"),
+                          usecols=lambda col: col == "a")
+
+def test_migrate_log_to_csv_seeds_once(tmp_path):
+    xlsx_path = tmp_path / "log.xlsx"
+    csv_path = tmp_path / "log.csv"
+    wb = Workbook()
+    wb.active.append(["Timestamp", "Asset ID", "Action", "Details"])
+    wb.active.append(["2024-01-01 10:00:00", "A1", "REGISTER", None])
+    wb.save(xlsx_path)
+
+    assert migrate_log_to_csv(str(xlsx_path), str(csv_path)) is True
+    assert csv_path.read_text().splitlines() == [
+        "Timestamp,Asset ID,Action,Details",
+        "2024-01-01 10:00:00,A1,REGISTER,",
+    ]
+    assert xlsx_path.exists()
+
+    # An existing CSV log is never overwritten
+    csv_path.write_text("kept\n")
+    assert migrate_log_to_csv(str(xlsx_path), str(csv_path)) is False
+    assert csv_path.read_text() == "kept\n"
+
+def test_migrate_log_to_csv_without_workbook(tmp_path):
+    assert migrate_log_to_csv(str(tmp_path / "log.xlsx"), str(tmp_path / "log.csv")) is False
+    assert not (tmp_path / "log.csv").exists()
+
 # --- Updated tests for new schema-based Excel creation ---
 
 def test_create_sheets_from_schema_json(tmp_path, json_schema_file, sample_json_schema):
@@ -11,16 +11,18 @@ import pandas as pd
 import pytest
 
 import expense_logger as el
+from utils import excel_handler
 
 # --- FIXTURE: SANDBOX CWD & DATA DIR ---
 
 @pytest.fixture(autouse=True)
 def tmp_cwd(tmp_path, monkeypatch):
     """
-    Run tests in a temp directory with a data/ subfolder.
+    Run tests in a temp directory with a data/ subfolder and its own read cache.
     """
     monkeypatch.chdir(tmp_path)
     (tmp_path / "data").mkdir()
+    monkeypatch.setattr(excel_handler, "CACHE_DIR", str(tmp_path / "cache"))
     return tmp_path
 
 # --- generate_expense_id tests ---
@@ -137,23 +139,11 @@ def test_prompt_for_category_invalid_then_valid(monkeypatch, capsys):
 @pytest.fixture(autouse=True)
 def patch_excel_tools(monkeypatch):
     """
-    Stub out create_sheets_from_schema, load_workbook, save_workbook to use real openpyxl.
+    Stub out load_workbook, save_workbook to use real openpyxl.
     """
     import expense_logger as module
 
-    def stub_create(schema_path, excel_path, sheet_name):
-        wb = openpyxl.Workbook()
-        ws = wb.active
-        ws.title = sheet_name
-        headers = [
-            "expense_id","project_id","department","amount","category",
-            "description","date","fiscal_year","recorded_by","recorded_on"
-        ]
-        ws.append(headers)
-        wb.save(excel_path)
-
-    monkeypatch.setattr(module, "create_sheets_from_schema", stub_create)
-    monkeypatch.setattr(module, "load_workbook", lambda path: openpyxl.load_workbook(path))
+    monkeypatch.setattr(module, "load_workbook", lambda path, **kwargs: openpyxl.load_workbook(path, **kwargs))
     monkeypatch.setattr(module, "save_workbook", lambda wb, path: wb.save(path))
 
 def test_append_creates_and_appends(tmp_cwd, capsys):
@@ -196,3 +186,26 @@ def test_append_existing_missing_sheet(tmp_cwd):
     # Accessing a missing sheet raises KeyError
     with pytest.raises(KeyError):
         el.append_to_expense_sheet({"anything": 1})
+
+def test_validate_rereads_expenses_after_append(budget_and_expenses):
+    # First call caches the allocations; no expenses recorded yet
+    ok, pid, fy, rem = el.validate_budget_available("DeptA", 10, "Cat1")
+    assert rem == 50
+
+    # Recording an expense changes the workbook, so the cached read is refreshed
+    el.append_to_expense_sheet({"expense_id": "E1", "project_id": "PRJ2", "amount": 30})
+    ok, pid, fy, rem = el.validate_budget_available("DeptA", 10, "Cat1")
+    assert rem == 20
+
+def test_append_to_existing_sheet_keeps_rows(tmp_cwd):
+    el.append_to_expense_sheet({"expense_id": "E1", "project_id": "PRJ1", "amount": 10})
+    el.append_to_expense_sheet({"expense_id": "E2", "project_id": "PRJ2", "amount": 20})
+
+    ws = openpyxl.load_workbook("data/expenses.xlsx")["Expenses"]
+    assert [cell.value for cell in ws[1]] == list(el.EXPENSE_SCHEMA["properties"])
+    assert ws["A1"].font.bold
+    assert [row[0] for row in ws.iter_rows(min_row=2, values_only=True)] == ["E1", "E2"]
+
+def test_validate_unknown_department_category(budget_and_expenses):
+    assert el.validate_budget_available("DeptA", 10, "Other") == (False, None, None, 0)
+    assert el.validate_budget_available("DeptZ", 10, "Cat1") == (False, None, None, 0)
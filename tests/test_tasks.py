@@ -64,6 +64,41 @@ def test_assign_task_creates_and_appends(tmp_path):
     assert row["Status"] == "Assigned"
     assert row["Details"] == "Fix wiring"
 
+def test_assign_task_appends_to_existing_tasks(tmp_path):
+    create_incidents_file(tmp_path)
+    create_contractors_file(tmp_path)
+
+    first = assign_task.assign_task("INC-123", "CTR-456", details="First")
+    second = assign_task.assign_task("INC-123", "CTR-456", details="Second")
+
+    # both tasks are kept, in assignment order
+    tasks_df = pd.read_excel(tmp_path / "data" / "tasks.xlsx")
+    assert list(tasks_df["Task ID"]) == [first["Task ID"], second["Task ID"]]
+    assert list(tasks_df["Details"]) == ["First", "Second"]
+
+def test_generate_task_id_is_compact_unique_and_ordered():
+    ids = [assign_task.generate_task_id() for _ in range(100)]
+    assert len(set(ids)) == len(ids)
+    assert ids == sorted(ids)
+    assert all(len(task_id) == len("TASK-") + 24 for task_id in ids)
+
+def test_generate_task_id_differs_across_processes_in_same_microsecond(monkeypatch):
+    # Freeze the clock and simulate a second process with its own node bits
+    monkeypatch.setattr(assign_task.time, "time_ns", lambda: 1_700_000_000_000_000_000)
+    monkeypatch.setattr(assign_task, "_task_last_micros", 0)
+    first = assign_task.generate_task_id()
+    monkeypatch.setattr(assign_task, "_task_node", assign_task._task_node ^ 1)
+    monkeypatch.setattr(assign_task, "_task_last_micros", 0)
+    second = assign_task.generate_task_id()
+    assert first != second
+
+def test_generate_task_id_sequence_does_not_wrap(monkeypatch):
+    monkeypatch.setattr(assign_task.time, "time_ns", lambda: 1_700_000_000_000_000_000)
+    monkeypatch.setattr(assign_task, "_task_last_micros", 0)
+    ids = [assign_task.generate_task_id() for _ in range(5000)]
+    assert len(set(ids)) == len(ids)
+    assert ids == sorted(ids)
+
 def test_update_task_changes_status_and_appends_note(tmp_path):
     # create an initial tasks.xlsx
     df = pd.DataFrame([{
@@ -111,3 +146,30 @@ def test_delete_task_removes_entry_and_creates_backup(tmp_path):
     remaining = pd.read_excel(tmp_path / "data" / "tasks.xlsx")
     assert len(remaining) == 1
     assert remaining.at[0, "Task ID"] == "TASK-002"
+
+def test_delete_task_with_duplicate_id_removes_one_row(tmp_path):
+    df = pd.DataFrame([
+        {"Task ID": "TASK-001", "Incident ID": "INC-1", "Status": "Assigned"},
+        {"Task ID": "TASK-001", "Incident ID": "INC-2", "Status": "Assigned"},
+        {"Task ID": "TASK-002", "Incident ID": "INC-3", "Status": "Assigned"},
+    ])
+    df.to_excel(tmp_path / "data" / "tasks.xlsx", index=False)
+
+    assert delete_task.delete_task("TASK-001", force=True, backup=False)
+
+    remaining = pd.read_excel(tmp_path / "data" / "tasks.xlsx")
+    assert list(remaining["Task ID"]) == ["TASK-001", "TASK-002"]
+    assert list(remaining["Incident ID"]) == ["INC-2", "INC-3"]
+
+def test_delete_task_keeps_numeric_and_date_cells(tmp_path):
+    import openpyxl
+    df = pd.DataFrame([
+        {"Task ID": "TASK-001", "Incident ID": 101, "Contractor ID": 7, "Assigned At": datetime(2025, 1, 1, 9), "Status": "Assigned"},
+        {"Task ID": "TASK-002", "Incident ID": 102, "Contractor ID": 8, "Assigned At": datetime(2025, 1, 2, 9), "Status": "Assigned"},
+    ])
+    df.to_excel(tmp_path / "data" / "tasks.xlsx", index=False)
+
+    assert delete_task.delete_task("TASK-001", force=True, backup=False)
+
+    ws = openpyxl.load_workbook(tmp_path / "data" / "tasks.xlsx").active
+    assert [cell.value for cell in ws[2]][:4] == ["TASK-002", 102, 8, datetime(2025, 1, 2, 9)]
@@ -1,12 +1,23 @@
 # utils/excel_handler.py
 
 import os
+import csv
 import json
+import hashlib
 import logging
 import pandas as pd
 from openpyxl import Workbook, load_workbook as openpyxl_load
 from openpyxl.utils.dataframe import dataframe_to_rows
 from openpyxl.utils.exceptions import InvalidFileException
+from utils.read_engine import READ_ENGINE
+
+# Parsed-sheet cache for read_excel_cached. Cached frames are unpickled on
+# read, so they are kept in the user's own cache directory rather than in
+# the shared data folder.
+CACHE_DIR = os.path.join(
+    os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'),
+    'cityinfraxls'
+)
 
 # Configure basic logging
 logging.basicConfig(
@@ -20,24 +31,90 @@ logging.basicConfig(
 
 logger = logging.getLogger('excel_handler')
 
-def load_workbook(path):
+def load_workbook(path, **kwargs):
     """
     Load an Excel workbook from the given file path.
     
     Args:
         path (str): Path to the Excel file
+        **kwargs: Additional keyword arguments passed to openpyxl.load_workbook
+            (e.g. read_only=True for search-only access)
         
     Returns:
         openpyxl.Workbook: Loaded workbook object
     """
     logger.info(f"Loading workbook from {path}")
     try:
-        wb = openpyxl_load(path)
+        wb = openpyxl_load(path, **kwargs)
         return wb
     except Exception as e:
         logger.error(f"Failed to load workbook from {path}: {str(e)}")
         raise
 
+def read_excel(path, **kwargs):
+    """
+    Read an Excel sheet into a DataFrame using the fastest available engine.
+    
+    Args:
+        path (str): Path to the Excel file
+        **kwargs: Additional keyword arguments passed to pd.read_excel
+        
+    Returns:
+        pd.DataFrame: Loaded sheet data (dict of DataFrames if sheet_name=None)
+    """
+    return pd.read_excel(path, engine=READ_ENGINE, **kwargs)
+
+def read_excel_cached(path, cache_dir=None, **kwargs):
+    """
+    Read an Excel sheet, reusing a pickled copy while the workbook is unchanged.
+    
+    The cache entry is keyed by the workbook path and read options and stores
+    the workbook's size and nanosecond mtime; it is reused only when both still
+    match exactly, so restored or copied workbooks are always re-read. Entries
+    live in a per-user cache directory, never beside the shared data files.
+    
+    Args:
+        path (str): Path to the Excel file
+        cache_dir (str, optional): Directory holding cached DataFrames.
+            Defaults to CACHE_DIR.
+        **kwargs: Additional keyword arguments passed to read_excel; callables
+            (e.g. usecols filters) cannot be keyed, so pass explicit lists
+        
+    Returns:
+        pd.DataFrame: Loaded sheet data
+    """
+    if any(callable(v) for v in kwargs.values()):
+        raise TypeError("read_excel_cached options must be plain values, not callables")
+    
+    source = os.path.abspath(path)
+    if cache_dir is None:
+        cache_dir = CACHE_DIR
+    
+    options = sorted(kwargs.items())
+    key = hashlib.md5(repr((source, options)).encode()).hexdigest()
+    cache_path = os.path.join(cache_dir, f"{key}.pkl")
+    
+    stat = os.stat(source)
+    signature = (stat.st_mtime_ns, stat.st_size)
+    
+    if os.path.exists(cache_path):
+        try:
+            entry = pd.read_pickle(cache_path)
+            if entry['signature'] == signature:
+                return entry['data']
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable cache entry for {path}: {str(e)}")
+    
+    df = read_excel(path, **kwargs)
+    try:
+        os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+        tmp_path = f"{cache_path}.tmp"
+        pd.to_pickle({'signature': signature, 'data': df}, tmp_path)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        logger.warning(f"Could not cache {path}: {str(e)}")
+    return df
+
 def save_workbook(wb, path):
     """
     Save a workbook to the specified path.
@@ -56,6 +133,37 @@ def save_workbook(wb, path):
         logger.error(f"Failed to save workbook to {path}: {str(e)}")
         raise
 
+def migrate_log_to_csv(xlsx_path, csv_path):
+    """
+    Seed a CSV log from the workbook log it replaces.
+    
+    Runs only when the workbook exists and the CSV does not, so earlier
+    entries carry over once and later calls do nothing. The workbook itself
+    is left in place.
+    
+    Args:
+        xlsx_path (str): Path to the old workbook log
+        csv_path (str): Path to the CSV log
+        
+    Returns:
+        bool: True if the CSV was created from the workbook, False otherwise
+    """
+    if os.path.exists(csv_path) or not os.path.exists(xlsx_path):
+        return False
+    
+    logger.info(f"Migrating log entries from {xlsx_path} to {csv_path}")
+    wb = load_workbook(xlsx_path, read_only=True)
+    try:
+        tmp_path = f"{csv_path}.tmp"
+        with open(tmp_path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            for row in wb.active.iter_rows(values_only=True):
+                writer.writerow(['' if value is None else value for value in row])
+        os.replace(tmp_path, csv_path)
+    finally:
+        wb.close()
+    return True
+
 def init_workbook(path, headers):
     """
     Initialize a new workbook with the specified headers if it doesn't exist.
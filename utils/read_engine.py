@@ -0,0 +1,11 @@
+# utils/read_engine.py
+
+# Prefer the Rust-backed calamine reader when python-calamine is installed;
+# pandas' openpyxl engine already opens workbooks read-only otherwise.
+# Kept free of side effects so scripts that configure their own logging can
+# import it without pulling in excel_handler's root logging setup.
+try:
+    import python_calamine  # noqa: F401
+    READ_ENGINE = 'calamine'
+except ImportError:
+    READ_ENGINE = 'openpyxl'